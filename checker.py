@@ -5,39 +5,67 @@ Main architecture checker orchestration.
 Coordinates all rule checkers and manages the overall checking process.
 """
 
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
-from .models import CheckResults, SubsystemInfo, FileInfo
+from .models import ArchError, CheckResults, SubsystemInfo
 from .rules import ComplexityRuleChecker, SubsystemRuleChecker, ImportRuleChecker, DomainRuleChecker, AppPageRuleChecker, ApiRuleChecker
 from .utils import FileCache, PathHelper, ExceptionHandler
-from .utils.file_utils import find_typescript_files
+from .utils.file_utils import find_subsystem_file_paths, is_test_file
 
 
 class ArchitectureChecker:
     """Main architecture checker that orchestrates all rule checking."""
     
     def __init__(self, target_path: str = "src"):
+        self._target_path_str = target_path
         self.path_helper = PathHelper(target_path)
         self.file_cache = FileCache()
         
-        # Initialize exception handler with project root
-        project_root = Path(target_path).resolve()
-        while project_root.parent != project_root and not (project_root / ".git").exists():
-            project_root = project_root.parent
-        self.exception_handler = ExceptionHandler(project_root)
-        
-        # Initialize rule checkers
-        self.complexity_checker = ComplexityRuleChecker(self.path_helper, self.file_cache, self.exception_handler)
+        # Initialize rule checkers (the complexity checker, which needs the
+        # exception handler and therefore the project root, is built on first use)
         self.subsystem_checker = SubsystemRuleChecker(self.path_helper, self.file_cache)
         self.import_checker = ImportRuleChecker(self.path_helper, self.file_cache)
         self.domain_checker = DomainRuleChecker(self.path_helper, self.file_cache)
         self.app_page_checker = AppPageRuleChecker(self.path_helper, self.file_cache)
         self.api_checker = ApiRuleChecker(self.path_helper, self.file_cache)
         
-        # Track subsystems for cross-rule coordination
+        # Track subsystems and index files for cross-rule coordination
         self.subsystems: List[SubsystemInfo] = []
+        self.subsystems_by_path: Dict[Path, SubsystemInfo] = {}
+        self.subsystem_children: Dict[Path, List[SubsystemInfo]] = {}
+        self.index_files: List[Path] = []
+        # Outbound dependency errors, found by run_all_checks ahead of the phases
+        self._outbound_errors: List[ArchError] = []
+    
+    @cached_property
+    def project_root(self) -> Path:
+        """Directory containing .git above the target path (or the filesystem root)."""
+        # Resolved lazily, and with plain string paths, since constructing a
+        # checker should not cost a symlink resolution and an upward stat walk
+        root_str = os.path.realpath(self._target_path_str)
+        while not os.path.exists(os.path.join(root_str, ".git")):
+            parent_str = os.path.dirname(root_str)
+            if parent_str == root_str:
+                break
+            root_str = parent_str
+        return Path(root_str)
+    
+    @cached_property
+    def exception_handler(self) -> ExceptionHandler:
+        """Exception handler for .architecture-exceptions files under the project root."""
+        return ExceptionHandler(self.project_root)
+    
+    @cached_property
+    def complexity_checker(self) -> ComplexityRuleChecker:
+        """Complexity checker, created on first use together with the exception handler."""
+        return ComplexityRuleChecker(self.path_helper, self.file_cache, self.exception_handler)
     
     def run_all_checks(self) -> CheckResults:
         """Run all architecture checks and return results."""
@@ -46,39 +74,74 @@ class ArchitectureChecker:
         
         # print(f"🏗️ Checking architectural boundaries in {self.path_helper.target_path}...")
         
-        # Single pass: find all subsystems and cache file info
-        self.subsystems = self._find_all_subsystems()
+        # Single walk of the tree: dependencies.json files and index files
+        deps_files, self.index_files = self._walk_target_tree()
+
+        # Build all subsystems and cache file info
+        self.subsystems = self._find_all_subsystems(deps_files)
+        self._index_subsystems()
         
-        # Find all index files for standalone checks
-        self.index_files = self._find_all_index_files()
+        # Outbound dependencies may be checked in worker processes, which
+        # are forked on first use and so must start before the phase threads
+        self._outbound_errors = self.import_checker.check_outbound_dependencies_parallel(self.subsystems)
         
-        # Run all checks in logical order
-        self._run_complexity_checks(results)
-        self._run_subsystem_checks(results)
-        self._run_import_checks(results)
-        self._run_standalone_index_checks(results)
-        self._run_domain_checks(results)
-        self._run_app_page_checks(results)
-        self._run_api_checks(results)
+        # Run all checks in logical order. The phases only read the
+        # subsystem list and the (already warmed) file cache, so they can
+        # run concurrently; results are collected in phase order on this
+        # thread to keep the report deterministic.
+        phases = [
+            self._run_complexity_checks,
+            self._run_subsystem_checks,
+            self._run_import_checks,
+            self._run_standalone_index_checks,
+            self._run_domain_checks,
+            self._run_app_page_checks,
+            self._run_api_checks,
+        ]
+        with ThreadPoolExecutor(max_workers=min(len(phases), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(phase) for phase in phases]
+            for future in futures:
+                results.extend(future.result())
 
         results.execution_time = time.time() - start_time
         return results
     
-    def _find_all_subsystems(self) -> List[SubsystemInfo]:
-        """Find all subsystems in target path."""
-        subsystems = []
+    def _walk_target_tree(self) -> Tuple[List[Path], List[Path]]:
+        """Collect dependencies.json files and non-test index files in one traversal."""
+        deps_files: List[Path] = []
+        index_ts: List[Path] = []
+        index_tsx: List[Path] = []
         
-        deps_files = self.path_helper.find_dependencies_files()
+        for dirpath, has_dependencies, index_names in self.path_helper.walk_once():
+            if has_dependencies:
+                deps_file = Path(dirpath) / "dependencies.json"
+                if "node_modules" not in str(deps_file):
+                    deps_files.append(deps_file)
+            for name in index_names:
+                index_file = Path(dirpath) / name
+                if not is_test_file(index_file):
+                    (index_ts if name == "index.ts" else index_tsx).append(index_file)
         
-        for deps_file in deps_files:
+        # Keep the previous ordering: every index.ts before any index.tsx
+        return deps_files, index_ts + index_tsx
+    
+    def _find_all_subsystems(self, deps_files: List[Path]) -> List[SubsystemInfo]:
+        """Build subsystem info for every dependencies.json file found."""
+        subsystems: List[SubsystemInfo] = []
+        
+        # Find all TypeScript files in each subsystem, then read and parse them
+        # concurrently into the file cache before building the subsystems
+        file_paths = [find_subsystem_file_paths(deps_file.parent) for deps_file in deps_files]
+        self.file_cache.preload(chain.from_iterable(file_paths))
+        
+        for deps_file, subsystem_file_paths in zip(deps_files, file_paths):
             subsystem_dir = deps_file.parent
             
             # Load subsystem info
             dependencies = self.file_cache.load_dependencies_json(deps_file)
 
-            # Find all TypeScript files in subsystem
-            files = self._find_subsystem_files(subsystem_dir)
-            total_lines = sum(f.lines for f in files)
+            files = [self.file_cache.get_file_info(file_path) for file_path in subsystem_file_paths]
+            total_lines = sum(map(attrgetter("lines"), files))
 
             # Determine subsystem type
             subsystem_type = dependencies.get("type")
@@ -100,176 +163,107 @@ class ArchitectureChecker:
         
         return subsystems
     
-    def _find_all_index_files(self) -> List[Path]:
-        """Find all index.ts and index.tsx files in target path."""
-        index_files = []
+    def _index_subsystems(self) -> None:
+        """Index subsystems by path and link each one to its nearest ancestor subsystem."""
+        self.subsystems_by_path = {subsystem.path: subsystem for subsystem in self.subsystems}
+        self.subsystem_children = {}
         
-        for pattern in ["**/index.ts", "**/index.tsx"]:
-            for index_file in self.path_helper.target_path.glob(pattern):
-                if not self._is_test_file(index_file):
-                    index_files.append(index_file)
+        for subsystem in self.subsystems:
+            for ancestor_dir in subsystem.path.parents:
+                if ancestor_dir in self.subsystems_by_path:
+                    self.subsystem_children.setdefault(ancestor_dir, []).append(subsystem)
+                    break
         
-        return index_files
-    
-    def _find_subsystem_files(self, subsystem_dir: Path) -> List[FileInfo]:
-        """Find TypeScript files in subsystem, excluding child subsystems.
-
-        This mirrors the logic of count_typescript_lines() to ensure consistency:
-        - Files directly in this directory belong to this subsystem
-        - Files in subdirectories without dependencies.json also belong to this subsystem
-        - Files in child subsystems (with dependencies.json) are excluded
-        """
-        files = []
-
-        # Only include direct files in this directory
-        for pattern in ["*.ts", "*.tsx"]:
-            for ts_file in subsystem_dir.glob(pattern):  # glob, not rglob!
-                if not self._is_test_file(ts_file):
-                    file_info = self.file_cache.get_file_info(ts_file)
-                    files.append(file_info)
-
-        # Recurse into subdirectories that are NOT subsystems
-        for subdir in subsystem_dir.iterdir():
-            if subdir.is_dir():
-                deps_file = subdir / "dependencies.json"
-                if not deps_file.exists():
-                    # Not a subsystem, recurse to include its files
-                    files.extend(self._find_subsystem_files(subdir))
-
-        return files
+        self.subsystem_checker.set_subsystem_index(self.subsystems_by_path, self.subsystem_children)
     
-    def _is_test_file(self, file_path: Path) -> bool:
-        """Check if file is a test file."""
-        name = file_path.name
-        return ".test." in name or ".spec." in name or "/__tests__/" in str(file_path)
-    
-    def _run_complexity_checks(self, results: CheckResults) -> None:
+    def _run_complexity_checks(self) -> List[ArchError]:
         """Run complexity-based checks."""
-        # Check complexity requirements for all directories
-        errors = self.complexity_checker.check_complexity_requirements()
-        for error in errors:
-            results.add_error(error)
-        
-        # Check subsystem completeness
-        errors = self.complexity_checker.check_subsystem_completeness(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        # Check complexity requirements for all directories and subsystem
+        # completeness, in one pass
+        return self.complexity_checker.check_all(self.subsystems)
     
-    def _run_subsystem_checks(self, results: CheckResults) -> None:
+    def _run_subsystem_checks(self) -> List[ArchError]:
         """Run subsystem-related checks."""
+        errors: List[ArchError] = []
+
         # Check subsystem declarations
-        errors = self.subsystem_checker.check_subsystem_declarations(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_subsystem_declarations(self.subsystems))
 
         # Check that declared subsystems actually exist
-        errors = self.subsystem_checker.check_declared_subsystems_exist(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_declared_subsystems_exist(self.subsystems))
 
         # Check dependencies.json format
-        errors = self.subsystem_checker.check_dependencies_json_format(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_dependencies_json_format(self.subsystems))
         
         # Check for redundancy
-        errors = self.subsystem_checker.check_hierarchical_redundancy(self.subsystems)
-        for error in errors:
-            results.add_error(error)
-        
-        errors = self.subsystem_checker.check_redundant_dependencies(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_hierarchical_redundancy(self.subsystems))
+        errors.extend(self.subsystem_checker.check_redundant_dependencies(self.subsystems))
         
         # Check for ancestor redundancy
-        errors = self.subsystem_checker.check_ancestor_redundancy(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_ancestor_redundancy(self.subsystems))
         
         # Check for domain utils redundancy
-        errors = self.subsystem_checker.check_domain_utils_redundancy(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_domain_utils_redundancy(self.subsystems))
         
         # Check for nonexistent dependencies
-        errors = self.subsystem_checker.check_nonexistent_dependencies(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_nonexistent_dependencies(self.subsystems))
 
         # Check for unused dependencies
-        errors = self.subsystem_checker.check_unused_dependencies(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_unused_dependencies(self.subsystems))
 
         # Check file/folder conflicts
-        errors = self.subsystem_checker.check_file_folder_conflicts()
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.subsystem_checker.check_file_folder_conflicts())
+        return errors
     
-    def _run_import_checks(self, results: CheckResults) -> None:
+    def _run_import_checks(self) -> List[ArchError]:
         """Run import-related checks."""
+        errors: List[ArchError] = []
+
         # Check import boundaries
-        errors = self.import_checker.check_import_boundaries(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.import_checker.check_import_boundaries(self.subsystems))
 
         # Check reexport boundaries
-        errors = self.import_checker.check_reexport_boundaries(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.import_checker.check_reexport_boundaries(self.subsystems))
 
-        # Check outbound dependencies
-        errors = self.import_checker.check_outbound_dependencies_parallel(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        # Check outbound dependencies (checked before the phases started)
+        errors.extend(self._outbound_errors)
 
         # Check router import patterns (warnings for importing from router index)
-        errors = self.import_checker.check_router_import_patterns(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.import_checker.check_router_import_patterns(self.subsystems))
 
         # Check domain utils import patterns
-        errors = self.import_checker.check_domain_utils_import_patterns(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.import_checker.check_domain_utils_import_patterns(self.subsystems))
+        return errors
     
-    def _run_standalone_index_checks(self, results: CheckResults) -> None:
+    def _run_standalone_index_checks(self) -> List[ArchError]:
         """Run checks on standalone index.ts files (not part of formal subsystems)."""
-        errors = self.import_checker.check_standalone_index_reexports(self.index_files)
-        for error in errors:
-            results.add_error(error)
+        return self.import_checker.check_standalone_index_reexports(self.index_files)
     
-    def _run_domain_checks(self, results: CheckResults) -> None:
+    def _run_domain_checks(self) -> List[ArchError]:
         """Run domain-specific checks."""
+        errors: List[ArchError] = []
+
         # Check domain structure
-        errors = self.domain_checker.check_domain_structure()
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.domain_checker.check_domain_structure())
 
         # Check domain import restrictions
-        errors = self.domain_checker.check_domain_import_restrictions()
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.domain_checker.check_domain_import_restrictions())
+        return errors
 
-    def _run_api_checks(self, results: CheckResults) -> None:
+    def _run_api_checks(self) -> List[ArchError]:
         """Run API route logging checks."""
-        errors = self.api_checker.check_api_route_logging(self.subsystems)
-        for error in errors:
-            results.add_error(error)
+        return self.api_checker.check_api_route_logging(self.subsystems)
 
-    def _run_app_page_checks(self, results: CheckResults) -> None:
+    def _run_app_page_checks(self) -> List[ArchError]:
         """Run app and page-specific checks."""
+        errors: List[ArchError] = []
+
         # Check that app subfolders with page.tsx are subsystems
-        errors = self.app_page_checker.check_page_tsx_subsystems()
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.app_page_checker.check_page_tsx_subsystems())
 
         # Check app isolation
-        errors = self.app_page_checker.check_app_isolation()
-        for error in errors:
-            results.add_error(error)
+        errors.extend(self.app_page_checker.check_app_isolation())
 
         # Check page isolation
-        errors = self.app_page_checker.check_page_isolation(self.subsystems)
-        for error in errors:
-            results.add_error(error)
\ No newline at end of file
+        errors.extend(self.app_page_checker.check_page_isolation(self.subsystems))
+        return errors
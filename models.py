@@ -5,9 +5,15 @@ Data models for architecture checking.
 Contains all data structures used throughout the architecture checking system.
 """
 
+import io
+import json
+import sys
+from collections import Counter
 from dataclasses import dataclass, field
+from itertools import chain
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple, Union
 from enum import Enum
 
 
@@ -88,7 +94,44 @@ class RecommendationType(Enum):
     OTHER = "Other"
 
 
-@dataclass
+# Enum values are looked up for every issue during summaries and JSON
+# serialization; a plain dict lookup is cheaper than the Enum.value descriptor.
+_ERROR_TYPE_VALUES: Dict[ErrorType, str] = {member: member.value for member in ErrorType}
+_SEVERITY_VALUES: Dict[Severity, str] = {member: member.value for member in Severity}
+_RECOMMENDATION_TYPE_VALUES: Dict[RecommendationType, str] = {
+    member: member.value for member in RecommendationType
+}
+
+# The same values pre-encoded as JSON strings for ArchError.to_json
+_ERROR_TYPE_JSON: Dict[ErrorType, str] = {
+    member: encode_basestring_ascii(value) for member, value in _ERROR_TYPE_VALUES.items()
+}
+_SEVERITY_JSON: Dict[Severity, str] = {
+    member: encode_basestring_ascii(value) for member, value in _SEVERITY_VALUES.items()
+}
+_RECOMMENDATION_TYPE_JSON: Dict[RecommendationType, str] = {
+    member: encode_basestring_ascii(value) for member, value in _RECOMMENDATION_TYPE_VALUES.items()
+}
+
+# Keys written by ArchError.to_dict before any metadata is merged in
+_ISSUE_KEYS = frozenset(("type", "severity", "message", "subsystem", "file", "line", "recommendation", "recommendation_type"))
+
+
+def _encode_json_value(value: Any, prefix: str) -> str:
+    """Encode a value exactly as json.dumps(indent=2, default=str) would when nested under prefix."""
+    if value is None:
+        return "null"
+    # Strings and ints (the common issue fields) go straight to the encoder
+    # json.dumps would end up calling, skipping its per-call setup
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring_ascii(value)
+    if value_type is int:
+        return int.__repr__(value)
+    return json.dumps(value, indent=2, default=str).replace("\n", "\n" + prefix)
+
+
+@dataclass(slots=True)
 class FileInfo:
     """Information about a TypeScript file."""
     path: Path
@@ -97,19 +140,24 @@ class FileInfo:
     content: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SubsystemInfo:
     """Information about a subsystem (directory with dependencies.json)."""
     path: Path
     name: str
-    dependencies: Dict = field(default_factory=dict)
+    dependencies: Dict[str, Any] = field(default_factory=dict)
     files: List[FileInfo] = field(default_factory=list)
     total_lines: int = 0
     parent_path: Optional[Path] = None
     subsystem_type: Optional[str] = None  # "boundary", "router", "domain", "utility", "page", "app", or "api"
 
 
-@dataclass
+# Recommendations are long and few distinct ones repeat across many issues;
+# keep them in a plain dict rather than the interpreter-wide intern table
+_RECOMMENDATION_STRINGS: Dict[str, str] = {}
+
+
+@dataclass(slots=True)
 class ArchError:
     """Represents an architectural error with enhanced metadata."""
     message: str
@@ -120,7 +168,16 @@ class ArchError:
     line_number: Optional[int] = None
     recommendation: Optional[str] = None
     recommendation_type: Optional[RecommendationType] = None
-    metadata: Optional[Dict] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None  # only set for the few issues that carry extra context
+    
+    def __post_init__(self) -> None:
+        """Share one string object per distinct subsystem, file and recommendation."""
+        if self.subsystem:
+            self.subsystem = sys.intern(self.subsystem)
+        if self.file_path:
+            self.file_path = sys.intern(self.file_path)
+        if self.recommendation:
+            self.recommendation = _RECOMMENDATION_STRINGS.setdefault(self.recommendation, self.recommendation)
     
     @classmethod
     def create_error(
@@ -168,17 +225,17 @@ class ArchError:
             recommendation_type=recommendation_type
         )
     
-    def to_dict(self) -> Dict:
+    def to_dict(self) -> Dict[str, Any]:
         """Convert error to dictionary for JSON serialization."""
         result = {
-            "type": self.error_type.value,
-            "severity": self.severity.value,
+            "type": _ERROR_TYPE_VALUES[self.error_type],
+            "severity": _SEVERITY_VALUES[self.severity],
             "message": self.message,
             "subsystem": self.subsystem,
             "file": self.file_path,
             "line": self.line_number,
             "recommendation": self.recommendation,
-            "recommendation_type": self.recommendation_type.value if self.recommendation_type else None
+            "recommendation_type": _RECOMMENDATION_TYPE_VALUES[self.recommendation_type] if self.recommendation_type else None
         }
 
         # Add metadata if present
@@ -186,15 +243,126 @@ class ArchError:
             result.update(self.metadata)
 
         return result
+    
+    def to_json(self, prefix: str = "") -> str:
+        """Serialize the error as indented JSON without building the to_dict() mapping.
+
+        Produces the same text as json.dumps(self.to_dict(), indent=2, default=str)
+        with every line after the first indented by prefix.
+        """
+        metadata = self.metadata
+        if metadata and (not _ISSUE_KEYS.isdisjoint(metadata) or any(type(key) is not str for key in metadata)):
+            # Metadata overriding a base key keeps the base key's position, and
+            # non-string keys are coerced (or rejected) by json; let json handle both
+            return _encode_json_value(self.to_dict(), prefix)
+
+        inner = prefix + "  "
+        recommendation_type = self.recommendation_type
+        fields = [
+            f'{inner}"type": {_ERROR_TYPE_JSON[self.error_type]}',
+            f'{inner}"severity": {_SEVERITY_JSON[self.severity]}',
+            f'{inner}"message": {_encode_json_value(self.message, inner)}',
+            f'{inner}"subsystem": {_encode_json_value(self.subsystem, inner)}',
+            f'{inner}"file": {_encode_json_value(self.file_path, inner)}',
+            f'{inner}"line": {_encode_json_value(self.line_number, inner)}',
+            f'{inner}"recommendation": {_encode_json_value(self.recommendation, inner)}',
+            f'{inner}"recommendation_type": '
+            f'{_RECOMMENDATION_TYPE_JSON[recommendation_type] if recommendation_type else "null"}',
+        ]
+        if metadata:
+            fields.extend(
+                f'{inner}{encode_basestring_ascii(key)}: {_encode_json_value(value, inner)}'
+                for key, value in metadata.items()
+            )
+        return "{\n" + ",\n".join(fields) + "\n" + prefix + "}"
+
+
+# Recommendation text patterns used to categorize issues that predate
+# RecommendationType. Evaluated in order; the first entry whose needles all
+# occur in the recommendation wins. A category may itself be a sequence of
+# (needle, category) refinements, falling back to "Other" if none match.
+_RecommendationCategory = Union[str, Tuple[Tuple[str, str], ...]]
+_RecommendationPatterns = Tuple[Tuple[Tuple[str, ...], _RecommendationCategory], ...]
 
+_RECOMMENDATION_PATTERNS: _RecommendationPatterns = (
+    # Router import warnings
+    (("Consider importing from specific child subsystem instead",), "Use specific child subsystem (not router index)"),
 
-@dataclass
+    # Service import violations
+    (("Move service import", "API/server code"), "Move service to API layer"),
+    (("Remove service import", "only domain index.ts and services/*"), "Fix domain service import"),
+    (("Remove cross-domain import",), "Remove cross-domain import"),
+
+    # File creation patterns (also covers the WARNING:/ERROR: prefixed variants)
+    (("Create missing files",), "Create missing subsystem files"),
+    (("Create", "README.md file"), "Create README documentation"),
+    (("Create or update", "index.ts to reexport"), "Create subsystem index"),
+
+    # Import fixes
+    (("Change import from", "via index.ts"), "Use subsystem interface"),
+    (("Change import from", "use utils index.ts"), "Use utils interface"),
+
+    # Dependency management
+    (("Add", "dependencies.json"), (
+        ("'allowed'", "Add to allowed dependencies"),
+        ("'allowedChildren'", "Add to allowedChildren"),
+    )),
+    (("Remove", "redundant"), "Remove redundant dependency"),
+    (("Remove", "dependencies.json"), "Remove forbidden dependency"),
+
+    # Subsystem declaration issues
+    (("Create", "dependencies.json to formalize this subsystem"), "Create or remove subsystem declaration"),
+    (("Remove", "'subsystems' array", "directory does not exist"), "Remove invalid subsystem declaration"),
+
+    # Structural issues
+    (("Move file contents",), "Resolve file/folder conflict"),
+    (("Either move implementation to this directory or import directly from original location",), "Fix upward reexport"),
+)
+
+# Checked after the case-insensitive "reexport" fallback
+_LEGACY_RECOMMENDATION_PATTERNS: _RecommendationPatterns = (
+    (("missing:",), (
+        ("dependencies.json", "Create dependencies.json"),
+        ("README.md", "Create README.md"),
+        ("ARCHITECTURE.md", "Create ARCHITECTURE.md"),
+    )),
+    (("index.ts",), "Use subsystem interface"),
+)
+
+
+def _resolve_recommendation_category(recommendation: str, category: _RecommendationCategory) -> str:
+    """Return a pattern's category, applying any nested refinements."""
+    if isinstance(category, str):
+        return category
+    for needle, refined in category:
+        if needle in recommendation:
+            return refined
+    return "Other"
+
+
+@dataclass(slots=True)
+class _IssueIndex:
+    """Grouped views and counts over a CheckResults' issues, built in one pass."""
+    all_issues: List[ArchError]
+    by_error_type: Dict[ErrorType, List[ArchError]] = field(default_factory=dict)
+    by_type: Counter[str] = field(default_factory=Counter)
+    by_subsystem: Counter[str] = field(default_factory=Counter)
+    by_recommendation: Counter[str] = field(default_factory=Counter)
+    exact_recommendations: Counter[str] = field(default_factory=Counter)
+    missing_recommendations: List[ArchError] = field(default_factory=list)
+    custom_threshold_count: int = 0
+
+
+@dataclass(slots=True)
 class CheckResults:
     """Results of architecture checking."""
     errors: List[ArchError] = field(default_factory=list)
     warnings: List[ArchError] = field(default_factory=list)
     execution_time: float = 0.0
     target_path: str = "src"
+    _index: Optional["_IssueIndex"] = field(default=None, init=False, repr=False, compare=False)
+    _index_key: Optional[Tuple[List[ArchError], int, List[ArchError], int]] = field(
+        default=None, init=False, repr=False, compare=False)
     
     def add_error(self, error: ArchError) -> None:
         """Add an error to the appropriate list based on severity."""
@@ -203,48 +371,44 @@ class CheckResults:
         else:
             self.warnings.append(error)
     
+    def extend(self, errors: Iterable[ArchError]) -> None:
+        """Add a batch of errors, partitioning them by severity."""
+        new_errors: List[ArchError] = []
+        new_warnings: List[ArchError] = []
+        for error in errors:
+            (new_errors if error.severity is Severity.ERROR else new_warnings).append(error)
+        self.errors.extend(new_errors)
+        self.warnings.extend(new_warnings)
+    
     def get_all_issues(self) -> List[ArchError]:
         """Get all issues (errors + warnings)."""
-        return self.errors + self.warnings
+        return self._get_index().all_issues
+    
+    def get_issues_by_type(self) -> Dict[ErrorType, List[ArchError]]:
+        """Get all issues grouped by error type, in first-seen order."""
+        return self._get_index().by_error_type
+    
+    def get_custom_threshold_count(self) -> int:
+        """Get the number of issues evaluated against a custom threshold."""
+        return self._get_index().custom_threshold_count
     
     def get_summary_by_type(self) -> Dict[str, int]:
         """Get count of issues by error type."""
-        summary = {}
-        for issue in self.get_all_issues():
-            error_type = issue.error_type.value
-            summary[error_type] = summary.get(error_type, 0) + 1
-        return summary
+        return self._get_index().by_type
     
     def get_summary_by_subsystem(self) -> Dict[str, int]:
         """Get count of issues by subsystem."""
-        summary = {}
-        for issue in self.get_all_issues():
-            if issue.subsystem:
-                subsystem = issue.subsystem
-                summary[subsystem] = summary.get(subsystem, 0) + 1
-        return summary
+        return self._get_index().by_subsystem
     
     def get_summary_by_recommendation(self) -> Dict[str, int]:
         """Get count of issues by recommendation type."""
-        summary = {}
-        for issue in self.get_all_issues():
-            if issue.recommendation:
-                rec_type = self._categorize_recommendation(issue.recommendation, issue)
-                summary[rec_type] = summary.get(rec_type, 0) + 1
-        return summary
+        return self._get_index().by_recommendation
     
     def get_top_exact_recommendations(self, limit: int = 3) -> List[tuple[str, int]]:
         """Get the most common exact recommendations."""
-        exact_summary = {}
-        missing_recommendations = []
-        
-        for issue in self.get_all_issues():
-            if issue.recommendation:
-                # Count exact recommendation text
-                exact_summary[issue.recommendation] = exact_summary.get(issue.recommendation, 0) + 1
-            else:
-                # Track issues without recommendations
-                missing_recommendations.append(issue)
+        index = self._get_index()
+        exact_summary = index.exact_recommendations
+        missing_recommendations = index.missing_recommendations
         
         # Warn about missing recommendations
         if missing_recommendations:
@@ -255,98 +419,139 @@ class CheckResults:
                 print(f"   • ... and {len(missing_recommendations) - 3} more")
             print()
         
-        # Return top exact recommendations
-        sorted_recommendations = sorted(exact_summary.items(), key=lambda x: x[1], reverse=True)
-        return sorted_recommendations[:limit]
+        # Return top exact recommendations (a bounded heap selection, ties in first-seen order)
+        return exact_summary.most_common(limit)
+    
+    def _get_index(self) -> "_IssueIndex":
+        """Return the cached issue index, rebuilding it if the issue lists changed.
+
+        The lists are public and get reassigned (main.py drops warnings that were
+        not requested), so the cache is keyed on the list objects and their lengths
+        rather than invalidated by add_error/extend alone.
+        """
+        errors, warnings = self.errors, self.warnings
+        key = self._index_key
+        if (self._index is None or key is None or
+                key[0] is not errors or key[1] != len(errors) or
+                key[2] is not warnings or key[3] != len(warnings)):
+            self._index = self._build_index()
+            self._index_key = (errors, len(errors), warnings, len(warnings))
+        return self._index
+    
+    def _build_index(self) -> "_IssueIndex":
+        """Group and count all issues, one field column at a time."""
+        all_issues = self.errors + self.warnings
+        
+        # Struct-of-arrays view of the fields the summaries need: each column is
+        # pulled out once and then counted by Counter's C loop
+        error_types = [issue.error_type for issue in all_issues]
+        subsystems = [issue.subsystem for issue in all_issues]
+        recommendations = [issue.recommendation for issue in all_issues]
+        recommendation_types = [issue.recommendation_type for issue in all_issues]
+        
+        by_error_type: Dict[ErrorType, List[ArchError]] = {}
+        for error_type, issue in zip(error_types, all_issues):
+            if error_type in by_error_type:
+                by_error_type[error_type].append(issue)
+            else:
+                by_error_type[error_type] = [issue]
+        
+        return _IssueIndex(
+            all_issues=all_issues,
+            by_error_type=by_error_type,
+            by_type=Counter(map(_ERROR_TYPE_VALUES.__getitem__, error_types)),
+            by_subsystem=Counter(filter(None, subsystems)),
+            # Explicitly typed issues (the common case) skip the categorization call
+            by_recommendation=Counter(
+                _RECOMMENDATION_TYPE_VALUES[recommendation_type] if recommendation_type
+                else self._categorize_recommendation(recommendation, issue)
+                for issue, recommendation, recommendation_type
+                in zip(all_issues, recommendations, recommendation_types)
+                if recommendation
+            ),
+            # Count exact recommendation text, and track issues without one
+            exact_recommendations=Counter(filter(None, recommendations)),
+            missing_recommendations=[
+                issue for issue, recommendation in zip(all_issues, recommendations)
+                if not recommendation
+            ],
+            custom_threshold_count=sum(
+                1 for issue in all_issues
+                if issue.metadata and 'custom_threshold' in issue.metadata
+            ),
+        )
     
     def _categorize_recommendation(self, recommendation: str, error: ArchError) -> str:
         """Categorize recommendation into types for summary."""
         # Use explicit type if available
         if error.recommendation_type:
-            return error.recommendation_type.value
+            return _RECOMMENDATION_TYPE_VALUES[error.recommendation_type]
 
         # Fallback to pattern matching for backwards compatibility
-        # Handle router import warnings
-        if "Consider importing from specific child subsystem instead" in recommendation:
-            return "Use specific child subsystem (not router index)"
-
-        # Handle service import violations
-        if "Move service import" in recommendation and "API/server code" in recommendation:
-            return "Move service to API layer"
-        elif "Remove service import" in recommendation and "only domain index.ts and services/*" in recommendation:
-            return "Fix domain service import"
-        elif "Remove cross-domain import" in recommendation:
-            return "Remove cross-domain import"
-        
-        # Handle file creation patterns (with new WARNING/ERROR prefixes)
-        elif "Create missing files" in recommendation or "ERROR: Create missing files" in recommendation:
-            return "Create missing subsystem files"
-        elif ("Create" in recommendation and "README.md file" in recommendation) or ("WARNING: Create" in recommendation and "README.md file" in recommendation) or ("ERROR: Create" in recommendation and "README.md file" in recommendation):
-            return "Create README documentation"
-        elif "Create or update" in recommendation and "index.ts to reexport" in recommendation:
-            return "Create subsystem index"
-        
-        # Handle import fixes
-        elif "Change import from" in recommendation and "via index.ts" in recommendation:
-            return "Use subsystem interface"
-        elif "Change import from" in recommendation and "use utils index.ts" in recommendation:
-            return "Use utils interface"
-        
-        # Handle dependency management
-        elif "Add" in recommendation and "dependencies.json" in recommendation:
-            if "'allowed'" in recommendation:
-                return "Add to allowed dependencies"
-            elif "'allowedChildren'" in recommendation:
-                return "Add to allowedChildren"
-        elif "Remove" in recommendation and "redundant" in recommendation:
-            return "Remove redundant dependency"
-        elif "Remove" in recommendation and "dependencies.json" in recommendation:
-            return "Remove forbidden dependency"
-        
-        # Handle subsystem declaration issues
-        elif "Create" in recommendation and "dependencies.json to formalize this subsystem" in recommendation:
-            return "Create or remove subsystem declaration"
-        elif "Remove" in recommendation and "'subsystems' array" in recommendation and "directory does not exist" in recommendation:
-            return "Remove invalid subsystem declaration"
-
-        # Handle structural issues
-        elif "Move file contents" in recommendation:
-            return "Resolve file/folder conflict"
-        elif "Either move implementation to this directory or import directly from original location" in recommendation:
-            return "Fix upward reexport"
-        elif "reexport" in recommendation.lower():
+        for needles, category in _RECOMMENDATION_PATTERNS:
+            if all(needle in recommendation for needle in needles):
+                return _resolve_recommendation_category(recommendation, category)
+
+        if "reexport" in recommendation.lower():
             return "Fix reexport boundary"
-        
+
         # Legacy fallbacks (for backwards compatibility)
-        elif "missing:" in recommendation:
-            if "dependencies.json" in recommendation:
-                return "Create dependencies.json"
-            elif "README.md" in recommendation:
-                return "Create README.md"
-            elif "ARCHITECTURE.md" in recommendation:
-                return "Create ARCHITECTURE.md"
-        elif "index.ts" in recommendation:
-            return "Use subsystem interface"
+        for needles, category in _LEGACY_RECOMMENDATION_PATTERNS:
+            if all(needle in recommendation for needle in needles):
+                return _resolve_recommendation_category(recommendation, category)
         
         return "Other"
     
     def has_errors(self) -> bool:
         """Check if there are any errors (not warnings)."""
-        return len(self.errors) > 0
+        return bool(self.errors)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get the summary section of the report."""
+        index = self._get_index()
+        return {
+            "total_errors": len(self.errors),
+            "total_warnings": len(self.warnings),
+            "by_type": index.by_type,
+            "by_subsystem": index.by_subsystem,
+            "by_recommendation": index.by_recommendation
+        }
     
-    def to_dict(self) -> Dict:
+    def to_dict(self) -> Dict[str, Any]:
         """Convert results to dictionary for JSON serialization."""
-        all_issues = self.get_all_issues()
         return {
             "timestamp": None,  # Will be set by reporter
             "target_path": self.target_path,
             "execution_time": self.execution_time,
-            "summary": {
-                "total_errors": len(self.errors),
-                "total_warnings": len(self.warnings),
-                "by_type": self.get_summary_by_type(),
-                "by_subsystem": self.get_summary_by_subsystem(),
-                "by_recommendation": self.get_summary_by_recommendation()
-            },
-            "errors": [issue.to_dict() for issue in all_issues]
-        }
\ No newline at end of file
+            "summary": self.get_summary(),
+            "errors": [issue.to_dict() for issue in chain(self.errors, self.warnings)]
+        }
+    
+    def to_json(self, timestamp: Optional[str] = None) -> str:
+        """Serialize results as indent=2 JSON, straight from the issue objects.
+
+        Equivalent to json.dumps(self.to_dict(), indent=2, default=str) with the
+        timestamp filled in, minus the throwaway per-issue dictionaries.
+        """
+        buffer = io.StringIO()
+        self.write_json(buffer, timestamp=timestamp)
+        return buffer.getvalue()
+    
+    def write_json(self, fp: TextIO, timestamp: Optional[str] = None) -> None:
+        """Write the to_json() document to a file object one issue at a time."""
+        header = json.dumps({
+            "timestamp": timestamp,
+            "target_path": self.target_path,
+            "execution_time": self.execution_time,
+            "summary": self.get_summary(),
+        }, indent=2, default=str)
+
+        # header ends with "\n}"; stream the errors array in as the last key
+        fp.write(header[:-2])
+        fp.write(',\n  "errors": [')
+        first = True
+        for issue in chain(self.errors, self.warnings):
+            fp.write("\n    " if first else ",\n    ")
+            fp.write(issue.to_json("    "))
+            first = False
+        fp.write("]\n}" if first else "\n  ]\n}")
@@ -5,12 +5,40 @@ Architecture check reporting module.
 Handles result reporting, JSON output generation, and console summaries.
 """
 
-import json
+import heapq
+import sys
+from collections import Counter, defaultdict
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict
+from typing import DefaultDict, List
 
-from .models import CheckResults, ErrorType, Severity
+from .models import CheckResults, Severity
+
+
+# Console separator lines
+_RULE = "-" * 72
+_DOUBLE_RULE = "=" * 72
+_SHORT_RULE = "-" * 40
+
+# Buffer size for streaming the JSON report to disk
+_REPORT_BUFFER_SIZE = 1 << 20
+
+# jq commands suggested for every report; the report path is appended
+_GENERAL_JQ_COMMANDS = (
+    "jq '.errors[] | select(.severity == \"error\")'",
+    "jq '.errors[] | select(.severity == \"warning\")'",
+    "jq '.summary'",
+    "jq -r '.errors[] | \"\\(.file):\\(.line) \\(.type): \\(.message)\"'",
+)
+
+# Labelled jq commands for the AI-friendly summary
+_AI_JQ_FILTERS = (
+    ("Get all errors", "jq '.errors[] | select(.severity == \"error\")'"),
+    ("Get summary", "jq '.summary'"),
+    ("Get by type", "jq '.errors[] | select(.type == \"TYPE\")'"),
+    ("Get by subsystem", "jq '.errors[] | select(.subsystem | contains(\"PATH\"))'"),
+)
 
 
 class ArchitectureReporter:
@@ -18,123 +46,135 @@ class ArchitectureReporter:
     
     def __init__(self, output_file: str = "test-results/architecture-check.json"):
         self.output_file = Path(output_file)
+        self._output_dir_ready = False
         self.complexity_threshold = 1000
         self.doc_threshold = 500
     
     def report_results(self, results: CheckResults, format_type: str = "console", suppressed_warning_count: int = 0) -> bool:
         """Report results to both JSON file and console. Returns True if no errors."""
-        # Ensure output directory exists
-        self.output_file.parent.mkdir(exist_ok=True)
+        # Ensure output directory exists (once per reporter)
+        self._ensure_output_dir()
 
-        # Write detailed JSON report
-        self._write_json_report(results)
+        timestamp = datetime.now().isoformat()
 
-        # Display results based on format
+        # Write detailed JSON report and display results based on format
         if format_type == "json":
-            self._display_json_output(results)
+            # Serialize once: the same document goes to the file and to stdout
+            report_json = results.to_json(timestamp=timestamp)
+            with open(self.output_file, 'wb') as f:
+                f.write(report_json.encode('utf-8'))
+            self._display_json_output(report_json)
         else:
+            self._write_json_report(results, timestamp)
             self._display_console_summary(results, suppressed_warning_count=suppressed_warning_count)
 
         return not results.has_errors()
     
-    def _write_json_report(self, results: CheckResults) -> None:
+    def _ensure_output_dir(self) -> None:
+        """Create the report directory the first time a report is written."""
+        if not self._output_dir_ready:
+            self.output_file.parent.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = True
+    
+    def _write_json_report(self, results: CheckResults, timestamp: str) -> None:
         """Write detailed JSON report to file."""
-        report_data = results.to_dict()
-        report_data["timestamp"] = datetime.now().isoformat()
-        
-        with open(self.output_file, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        # The report is ASCII (json escapes everything else); one large buffer
+        # means the many small streamed writes reach the OS in a few big ones
+        with open(self.output_file, 'w', encoding='utf-8', buffering=_REPORT_BUFFER_SIZE) as f:
+            results.write_json(f, timestamp=timestamp)
     
     def _display_console_summary(self, results: CheckResults, suppressed_warning_count: int = 0) -> None:
         """Display summary information on console."""
         # print(f"⏱️  Completed in {results.execution_time:.2f} seconds")
-        print()
+        # The summary is collected into lines and written in one go
+        lines = [""]
 
         # Show summary statistics
         total_errors = len(results.errors)
         total_warnings = len(results.warnings)
         
+        # A clean run needs none of the summaries below
+        if total_errors == 0 and total_warnings == 0:
+            lines.append("✅ Architecture check passed!")
+            if suppressed_warning_count > 0:
+                lines.append(f"ℹ️  {suppressed_warning_count} warning(s) suppressed - run with --include-warnings to see them")
+            lines.append(f"Detailed report: {self.output_file}")
+            self._write_lines(lines)
+            return
+        
         # Check for custom thresholds usage
-        custom_threshold_count = sum(1 for issue in results.get_all_issues() 
-                                   if issue.metadata and 'custom_threshold' in issue.metadata)
+        custom_threshold_count = results.get_custom_threshold_count()
         
         if custom_threshold_count > 0:
-            print(f"🔧 Using custom thresholds from .architecture-exceptions for {custom_threshold_count} issue(s)")
-            print()
-        
-        if total_errors > 0 or total_warnings > 0:
-            print("📊 Summary:")
-            print("=" * 72)
-            print(f"• Total errors: {total_errors}")
-            print(f"• Total warnings: {total_warnings}")
-            print()
-            
-            # Breakdown by error type
-            type_summary = results.get_summary_by_type()
-            if type_summary:
-                print("🔍 By error type:")
-                for error_type, count in sorted(type_summary.items()):
-                    print(f"  • {error_type}: {count}")
-                print()
-            
-            # Breakdown by subsystem
-            subsystem_summary = results.get_summary_by_subsystem()
-            if subsystem_summary:
-                print("📁 By subsystem:")
-                # Show top 10 subsystems with most issues
-                sorted_subsystems = sorted(subsystem_summary.items(), 
-                                         key=lambda x: x[1], reverse=True)
-                for subsystem, count in sorted_subsystems:
-                    print(f"  • {subsystem}: {count}")
-                print()
-            
-            # Top exact recommendations (with missing recommendation check)
-            print("🎯 Top actionable recommendations:")
-            top_exact = results.get_top_exact_recommendations(limit=10)
-            if top_exact:
-                for recommendation, count in top_exact:
-                    # Show full recommendation without truncation
-                    print(f"  • ({count}×) {recommendation}")
-                print()
-            
-            # Breakdown by recommendation category  
-            recommendation_summary = results.get_summary_by_recommendation()
-            if recommendation_summary:
-                print("📊 By recommendation type:")
-                sorted_recommendations = sorted(recommendation_summary.items(), 
-                                              key=lambda x: x[1], reverse=True)[:8]
-                for recommendation, count in sorted_recommendations:
-                    print(f"  • {recommendation}: {count}")
-                print()
-            
-            # Reference to detailed log
-            print("📋 Detailed results:")
-            print("-" * 72)
-            print(f"Full report: {self.output_file}")
-            print()
-        else:
-            print("✅ Architecture check passed!")
-            if suppressed_warning_count > 0:
-                print(f"ℹ️  {suppressed_warning_count} warning(s) suppressed - run with --include-warnings to see them")
-            print(f"Detailed report: {self.output_file}")
+            lines.append(f"🔧 Using custom thresholds from .architecture-exceptions for {custom_threshold_count} issue(s)")
+            lines.append("")
+        
+        lines.append("📊 Summary:")
+        lines.append(_DOUBLE_RULE)
+        lines.append(f"• Total errors: {total_errors}")
+        lines.append(f"• Total warnings: {total_warnings}")
+        lines.append("")
+        
+        # Breakdown by error type
+        type_summary = results.get_summary_by_type()
+        if type_summary:
+            lines.append("🔍 By error type:")
+            lines.extend(f"  • {error_type}: {count}" for error_type, count in sorted(type_summary.items()))
+            lines.append("")
+        
+        # Breakdown by subsystem
+        subsystem_summary = results.get_summary_by_subsystem()
+        if subsystem_summary:
+            lines.append("📁 By subsystem:")
+            # Show top 10 subsystems with most issues
+            sorted_subsystems = sorted(subsystem_summary.items(), key=itemgetter(1), reverse=True)
+            lines.extend(f"  • {subsystem}: {count}" for subsystem, count in sorted_subsystems)
+            lines.append("")
+        
+        # Top exact recommendations (with missing recommendation check)
+        lines.append("🎯 Top actionable recommendations:")
+        # get_top_exact_recommendations prints its own warnings, so flush first
+        self._write_lines(lines)
+        lines = []
+        top_exact = results.get_top_exact_recommendations(limit=10)
+        if top_exact:
+            # Show full recommendation without truncation
+            lines.extend(f"  • ({count}×) {recommendation}" for recommendation, count in top_exact)
+            lines.append("")
+        
+        # Breakdown by recommendation category  
+        recommendation_summary = results.get_summary_by_recommendation()
+        if recommendation_summary:
+            lines.append("📊 By recommendation type:")
+            sorted_recommendations = heapq.nlargest(8, recommendation_summary.items(), key=itemgetter(1))
+            lines.extend(f"  • {recommendation}: {count}" for recommendation, count in sorted_recommendations)
+            lines.append("")
+        
+        # Reference to detailed log
+        lines.append("📋 Detailed results:")
+        lines.append(_RULE)
+        lines.append(f"Full report: {self.output_file}")
+        lines.append("")
+        self._write_lines(lines)
+    
+    def _write_lines(self, lines: List[str]) -> None:
+        """Write console lines to stdout with a single write call."""
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
     
     def get_grep_suggestions(self, error_type: str = None, subsystem: str = None) -> list[str]:
         """Get grep command suggestions for filtering the JSON output."""
         suggestions = []
+        output_file = str(self.output_file)
         
         if error_type:
-            suggestions.append(f"jq '.errors[] | select(.type == \"{error_type}\")' {self.output_file}")
+            suggestions.append(f"jq '.errors[] | select(.type == \"{error_type}\")' {output_file}")
         
         if subsystem:
-            suggestions.append(f"jq '.errors[] | select(.subsystem | contains(\"{subsystem}\"))' {self.output_file}")
+            suggestions.append(f"jq '.errors[] | select(.subsystem | contains(\"{subsystem}\"))' {output_file}")
         
         # General useful filters
-        suggestions.extend([
-            f"jq '.errors[] | select(.severity == \"error\")' {self.output_file}",
-            f"jq '.errors[] | select(.severity == \"warning\")' {self.output_file}",
-            f"jq '.summary' {self.output_file}",
-            f"jq -r '.errors[] | \"\\(.file):\\(.line) \\(.type): \\(.message)\"' {self.output_file}"
-        ])
+        suggestions.extend(f"{command} {output_file}" for command in _GENERAL_JQ_COMMANDS)
         
         return suggestions
     
@@ -144,63 +184,49 @@ class ArchitectureReporter:
             return
         
         print("\n🔍 Error Breakdown:")
-        print("-" * 72)
+        print(_RULE)
         
         # Group by error type
-        by_type: Dict[ErrorType, list] = {}
-        for issue in results.get_all_issues():
-            if issue.error_type not in by_type:
-                by_type[issue.error_type] = []
-            by_type[issue.error_type].append(issue)
+        by_type = results.get_issues_by_type()
         
         for error_type, issues in by_type.items():
             print(f"\n{error_type.value.upper()}: {len(issues)} issues")
-            print("-" * 40)
+            print(_SHORT_RULE)
             
-            # Group by subsystem within each error type
-            by_subsystem: Dict[str, list] = {}
+            # Count severities per subsystem within each error type
+            severity_by_subsystem: DefaultDict[str, Counter[str]] = defaultdict(Counter)
             for issue in issues:
-                subsystem = issue.subsystem or "unknown"
-                if subsystem not in by_subsystem:
-                    by_subsystem[subsystem] = []
-                by_subsystem[subsystem].append(issue)
+                severity_by_subsystem[issue.subsystem or "unknown"][issue.severity.value] += 1
             
-            for subsystem, subsystem_issues in by_subsystem.items():
-                severity_counts = {}
-                for issue in subsystem_issues:
-                    sev = issue.severity.value
-                    severity_counts[sev] = severity_counts.get(sev, 0) + 1
-                
+            for subsystem, severity_counts in severity_by_subsystem.items():
                 severity_str = ", ".join(f"{sev}: {count}" for sev, count in severity_counts.items())
-                print(f"  {subsystem}: {len(subsystem_issues)} ({severity_str})")
+                print(f"  {subsystem}: {sum(severity_counts.values())} ({severity_str})")
         
-        print("-" * 72)
+        print(_RULE)
     
     def generate_ai_friendly_summary(self, results: CheckResults) -> str:
         """Generate a summary specifically designed for AI agents."""
-        if not results.errors and not results.warnings:
-            return f"✅ Architecture check passed! Report: {self.output_file}"
+        output_file = str(self.output_file)
+        total_errors = len(results.errors)
+        total_warnings = len(results.warnings)
+        if not total_errors and not total_warnings:
+            return f"✅ Architecture check passed! Report: {output_file}"
         
         summary_parts = [
-            f"🚨 Architecture issues found: {len(results.errors)} errors, {len(results.warnings)} warnings",
-            f"📄 Full report: {self.output_file}",
+            f"🚨 Architecture issues found: {total_errors} errors, {total_warnings} warnings",
+            f"📄 Full report: {output_file}",
             "",
             "🎯 Quick filters for AI agents:"
         ]
         
         # Add useful jq commands for common use cases
-        summary_parts.extend([
-            f"  # Get all errors: jq '.errors[] | select(.severity == \"error\")' {self.output_file}",
-            f"  # Get summary: jq '.summary' {self.output_file}",
-            f"  # Get by type: jq '.errors[] | select(.type == \"TYPE\")' {self.output_file}",
-            f"  # Get by subsystem: jq '.errors[] | select(.subsystem | contains(\"PATH\"))' {self.output_file}",
-            ""
-        ])
+        summary_parts.extend(f"  # {label}: {command} {output_file}" for label, command in _AI_JQ_FILTERS)
+        summary_parts.append("")
         
         # Show top error types and subsystems
         type_summary = results.get_summary_by_type()
         if type_summary:
-            top_types = sorted(type_summary.items(), key=lambda x: x[1], reverse=True)[:3]
+            top_types = heapq.nlargest(3, type_summary.items(), key=itemgetter(1))
             summary_parts.append("🔥 Top error types:")
             for error_type, count in top_types:
                 summary_parts.append(f"  • {error_type}: {count}")
@@ -208,15 +234,13 @@ class ArchitectureReporter:
         
         subsystem_summary = results.get_summary_by_subsystem()
         if subsystem_summary:
-            top_subsystems = sorted(subsystem_summary.items(), key=lambda x: x[1], reverse=True)[:3]
+            top_subsystems = heapq.nlargest(3, subsystem_summary.items(), key=itemgetter(1))
             summary_parts.append("📁 Top problematic subsystems:")
             for subsystem, count in top_subsystems:
                 summary_parts.append(f"  • {subsystem}: {count}")
         
         return "\n".join(summary_parts)
     
-    def _display_json_output(self, results: CheckResults) -> None:
+    def _display_json_output(self, report_json: str) -> None:
         """Display results in JSON format."""
-        report_data = results.to_dict()
-        report_data["timestamp"] = datetime.now().isoformat()
-        print(json.dumps(report_data, indent=2, default=str))
\ No newline at end of file
+        print(report_json)
\ No newline at end of file
@@ -6,26 +6,42 @@ Discovers subsystems and runs all Rule of 6 checks.
 """
 
 import json
+import os
 import time
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
-from ..models import CheckResults, SubsystemInfo, FileInfo
-from ..utils.file_utils import FileCache, is_test_file
+from ..models import CheckResults, SubsystemInfo
+from ..utils.file_utils import FileCache, IncrementalCache, is_test_file
 from ..utils.exception_handler import RuleOf6ExceptionHandler
 from .rules import RuleOf6Rules
 
 
+# Directories that never hold project subsystems and are not walked
+_PRUNED_DIRS = frozenset({"node_modules", ".git"})
+
+# Files or directories that mark the project root
+_ROOT_MARKERS = frozenset({'package.json', '.git', 'pnpm-lock.yaml'})
+
+
 class RuleOf6Checker:
     """Orchestrates Rule of 6 checks across the codebase."""
 
-    def __init__(self, target_path: str = "src"):
+    def __init__(self, target_path: str = "src", cache_file: Optional[str] = None):
         self.target_path = Path(target_path)
         self.file_cache = FileCache()
 
         # Find project root
         project_root = self._find_project_root(self.target_path)
 
+        # Reuse parse results kept in cache_file by earlier runs for unchanged
+        # files; without one (the default) nothing is written between runs
+        if cache_file is not None:
+            self.file_cache.incremental_cache = IncrementalCache(Path(cache_file))
+
         # Set up exception handling
         self.exception_handler = RuleOf6ExceptionHandler(project_root)
         self.exception_handler.load_exceptions(self.target_path)
@@ -42,70 +58,109 @@ class RuleOf6Checker:
         subsystems = self._find_all_subsystems()
 
         # Run all checks
-        for error in self.rules.check_subsystem_count(subsystems):
-            results.add_error(error)
-
-        for error in self.rules.check_file_functions(subsystems):
-            results.add_error(error)
-
-        for error in self.rules.check_object_parameter_keys(subsystems):
-            results.add_error(error)
+        results.extend(self.rules.check_subsystem_count(subsystems))
+        results.extend(self.rules.check_all_file_rules(subsystems))
+        if self.file_cache.incremental_cache is not None:
+            self.file_cache.incremental_cache.save()
 
         results.execution_time = time.time() - start_time
         return results
 
     def _find_all_subsystems(self) -> List[SubsystemInfo]:
         """Find all subsystems in target path."""
-        subsystems = []
-
-        for deps_file in sorted(self.target_path.rglob("dependencies.json")):
-            subsystem_dir = deps_file.parent
-            dependencies = self.file_cache.load_dependencies_json(deps_file)
-            files = self._find_subsystem_files(subsystem_dir)
-            total_lines = sum(f.lines for f in files)
-            subsystem_type = dependencies.get("type")
-
-            subsystem = SubsystemInfo(
-                path=subsystem_dir,
-                name=subsystem_dir.name,
-                dependencies=dependencies,
-                files=files,
-                total_lines=total_lines,
-                parent_path=subsystem_dir.parent,
-                subsystem_type=subsystem_type,
-            )
-            subsystems.append(subsystem)
-
-        return subsystems
-
-    def _find_subsystem_files(self, subsystem_dir: Path) -> List[FileInfo]:
-        """Find TypeScript files in a subsystem, excluding child subsystems."""
-        files = []
-
-        for pattern in ["*.ts", "*.tsx"]:
-            for ts_file in subsystem_dir.glob(pattern):
-                if not is_test_file(ts_file):
-                    file_info = self.file_cache.get_file_info(ts_file)
-                    files.append(file_info)
-
-        for subdir in subsystem_dir.iterdir():
-            if subdir.is_dir() and not (subdir / "dependencies.json").exists():
-                files.extend(self._find_subsystem_files(subdir))
-
-        return files
+        files_by_subsystem = self._collect_subsystem_files()
+        # Sorting on the parts tuples gives the same order as comparing Paths,
+        # with C-level tuple comparisons instead of Path.__lt__ calls
+        deps_files = sorted(
+            (subsystem_dir / "dependencies.json" for subsystem_dir in files_by_subsystem),
+            key=attrgetter("parts"),
+        )
+        file_paths = [files_by_subsystem[deps_file.parent] for deps_file in deps_files]
+
+        # Read every file in one I/O-bound pass over the whole project (rather
+        # than one thread per subsystem, where a large subsystem holds up its
+        # thread); the subsystems are then built from the warm cache
+        self.file_cache.preload(chain.from_iterable(file_paths))
+        return [
+            self._build_subsystem(deps_file, subsystem_files)
+            for deps_file, subsystem_files in zip(deps_files, file_paths)
+        ]
+
+    def _collect_subsystem_files(self) -> Dict[Path, List[Path]]:
+        """Walk the target tree once, assigning TypeScript files to their nearest subsystem.
+
+        Files in a directory without dependencies.json belong to the closest
+        ancestor that has one, in the same order a per-subsystem walk gives.
+        """
+        files_by_subsystem: Dict[Path, List[Path]] = {}
+        owners: Dict[str, Optional[Path]] = {}
+
+        for dirpath, dirnames, filenames in os.walk(self.target_path):
+            dirnames[:] = [name for name in dirnames if name not in _PRUNED_DIRS]
+
+            if "dependencies.json" in filenames:
+                owner: Optional[Path] = Path(dirpath)
+                files_by_subsystem[owner] = []
+            else:
+                owner = owners.get(os.path.dirname(dirpath))
+            owners[dirpath] = owner
+            if owner is None:
+                continue
+
+            ts_files = [name for name in filenames if name.endswith(".ts")]
+            tsx_files = [name for name in filenames if name.endswith(".tsx")]
+            subsystem_files = files_by_subsystem[owner]
+            for name in ts_files + tsx_files:
+                file_path = Path(dirpath, name)
+                if not is_test_file(file_path):
+                    subsystem_files.append(file_path)
+
+        return files_by_subsystem
+
+    def _build_subsystem(self, deps_file: Path, file_paths: List[Path]) -> SubsystemInfo:
+        """Build subsystem info for one dependencies.json file."""
+        subsystem_dir = deps_file.parent
+        dependencies = self.file_cache.load_dependencies_json(deps_file)
+        files = [self.file_cache.get_file_info(file_path) for file_path in file_paths]
+        total_lines = sum(map(attrgetter("lines"), files))
+        subsystem_type = dependencies.get("type")
+
+        return SubsystemInfo(
+            path=subsystem_dir,
+            name=subsystem_dir.name,
+            dependencies=dependencies,
+            files=files,
+            total_lines=total_lines,
+            parent_path=subsystem_dir.parent,
+            subsystem_type=subsystem_type,
+        )
 
     @staticmethod
     def _find_project_root(target_path: Path) -> Path:
         """Find project root by looking for common markers."""
-        current = target_path.resolve()
-        root_markers = {'package.json', '.git', 'pnpm-lock.yaml'}
-        max_depth = 10
-
-        for _ in range(max_depth):
-            if any((current / marker).exists() for marker in root_markers):
-                return current
-            if current == current.parent:
-                break
-            current = current.parent
-
-        return Path.cwd()
+        root = _find_marked_ancestor(str(target_path.resolve()))
+        return Path(root) if root is not None else Path.cwd()
+
+
+@lru_cache(maxsize=None)
+def _find_marked_ancestor(start: str, max_depth: int = 10) -> Optional[str]:
+    """Closest directory (up to max_depth levels up) containing a root marker.
+
+    Takes an absolute path so the memoized answer does not depend on the
+    working directory; each directory is checked with one listing instead of
+    a stat per marker.
+    """
+    current = start
+    for _ in range(max_depth):
+        try:
+            with os.scandir(current) as entries:
+                if any(entry.name in _ROOT_MARKERS for entry in entries):
+                    return current
+        except OSError:
+            pass
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+
+    return None
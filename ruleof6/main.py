@@ -9,6 +9,7 @@ Usage:
 
 import sys
 import argparse
+from pathlib import Path
 
 from .checker import RuleOf6Checker
 from .reporter import RuleOf6Reporter
@@ -29,9 +30,22 @@ def main():
         default='test-results/rule-of-6-check.json',
         help='Output file for detailed JSON report',
     )
+    parser.add_argument(
+        '--cache-file',
+        help='File keeping parse results between runs (default: ruleof6-cache.json next to the report)',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Parse every file instead of reusing results from earlier runs',
+    )
     args = parser.parse_args()
 
-    checker = RuleOf6Checker(args.target_path)
+    if args.no_cache:
+        cache_file = None
+    else:
+        cache_file = args.cache_file or str(Path(args.output).parent / 'ruleof6-cache.json')
+
+    checker = RuleOf6Checker(args.target_path, cache_file)
     results = checker.run_all_checks()
 
     reporter = RuleOf6Reporter(args.output)
@@ -5,46 +5,60 @@ Rule of 6 check reporting.
 Handles console output and JSON report generation.
 """
 
-import json
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
-from ..models import ArchError, CheckResults, ErrorType, Severity
+from ..models import CheckResults, ErrorType, Severity
 
 
+# Buffer size for streaming the JSON report to disk
+_REPORT_BUFFER_SIZE = 1 << 20
+
+# Sort rank for violations within a section: errors first, everything else after
+_SEVERITY_RANK = {Severity.ERROR: 0}
+
 # Display order and section titles for violation types
-_SECTION_ORDER = [
+_SECTION_TITLES = [
     (ErrorType.SUBSYSTEM_COUNT, "Subsystems Per Parent"),
     (ErrorType.FILE_FUNCTIONS, "Functions Per File"),
     (ErrorType.FUNCTION_LINES, "Function Line Count"),
     (ErrorType.FUNCTION_ARGS, "Function Arguments / Object Keys"),
 ]
 
+# The same, with each title's underline precomputed
+_SECTION_ORDER = [(error_type, title, "=" * len(title)) for error_type, title in _SECTION_TITLES]
+
 
 class RuleOf6Reporter:
     """Handles reporting of Rule of 6 check results."""
 
     def __init__(self, output_file: str = "test-results/rule-of-6-check.json"):
         self.output_file = Path(output_file)
+        self._output_dir_ready = False
 
     def report_results(self, results: CheckResults) -> bool:
         """Report results to both JSON file and console. Returns True if no errors."""
-        self.output_file.parent.mkdir(exist_ok=True)
+        self._ensure_output_dir()
         self._write_json_report(results)
         self._display_console_summary(results)
         return not results.has_errors()
 
+    def _ensure_output_dir(self) -> None:
+        """Create the report directory the first time a report is written."""
+        if not self._output_dir_ready:
+            self.output_file.parent.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = True
+
     # ------------------------------------------------------------------
     # JSON report
     # ------------------------------------------------------------------
 
     def _write_json_report(self, results: CheckResults) -> None:
         """Write detailed JSON report to file."""
-        report_data = results.to_dict()
-        report_data["timestamp"] = datetime.now().isoformat()
-        with open(self.output_file, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        with open(self.output_file, 'w', encoding='utf-8', buffering=_REPORT_BUFFER_SIZE) as f:
+            results.write_json(f, timestamp=datetime.now().isoformat())
 
     # ------------------------------------------------------------------
     # Console summary
@@ -55,25 +69,23 @@ class RuleOf6Reporter:
         total_errors = len(results.errors)
         total_warnings = len(results.warnings)
 
+        # Collect the whole summary and write it in one go
         if total_errors > 0 or total_warnings > 0:
-            print(f"Rule of 6: {total_errors} errors, {total_warnings} warnings")
-            print()
-            self._display_top_violations(results)
-            print(f"Detailed report: {self.output_file}")
+            lines = [f"Rule of 6: {total_errors} errors, {total_warnings} warnings", ""]
+            lines.extend(self._top_violation_lines(results))
         else:
-            print("Rule of 6 checks passed!")
-            print(f"Detailed report: {self.output_file}")
+            lines = ["Rule of 6 checks passed!"]
+        lines.append(f"Detailed report: {self.output_file}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def _display_top_violations(self, results: CheckResults) -> None:
-        """Display top 10 violations for each violation type."""
-        all_issues = results.get_all_issues()
+    def _top_violation_lines(self, results: CheckResults) -> List[str]:
+        """Format the top 10 violations for each violation type."""
+        lines: List[str] = []
 
         # Group by error type
-        by_type: Dict[ErrorType, List[ArchError]] = {}
-        for issue in all_issues:
-            by_type.setdefault(issue.error_type, []).append(issue)
+        by_type = results.get_issues_by_type()
 
-        for error_type, section_title in _SECTION_ORDER:
+        for error_type, section_title, section_underline in _SECTION_ORDER:
             violations = by_type.get(error_type)
             if not violations:
                 continue
@@ -81,11 +93,11 @@ class RuleOf6Reporter:
             # Sort by severity (errors first) then by message
             sorted_violations = sorted(
                 violations,
-                key=lambda v: (0 if v.severity == Severity.ERROR else 1, v.message),
+                key=lambda v: (_SEVERITY_RANK.get(v.severity, 1), v.message),
             )
 
-            print(section_title)
-            print("=" * len(section_title))
+            lines.append(section_title)
+            lines.append(section_underline)
 
             for i, violation in enumerate(sorted_violations[:10], 1):
                 severity_icon = "E" if violation.severity == Severity.ERROR else "W"
@@ -97,11 +109,13 @@ class RuleOf6Reporter:
                 elif violation.subsystem:
                     location = f"  {violation.subsystem}"
 
-                print(f"{i:2}. [{severity_icon}] {violation.message}")
+                lines.append(f"{i:2}. [{severity_icon}] {violation.message}")
                 if location:
-                    print(f"    {location}")
+                    lines.append(f"    {location}")
 
             if len(sorted_violations) > 10:
-                print(f"     ... and {len(sorted_violations) - 10} more")
+                lines.append(f"     ... and {len(sorted_violations) - 10} more")
+
+            lines.append("")
 
-            print()
+        return lines
@@ -9,16 +9,18 @@ Contains the 4 Rule of 6 checks:
 - Function arguments: max 6 (or 1 object with max 6 keys)
 """
 
+import os
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
 from ..models import (
     ArchError, ErrorType, Severity, RecommendationType, SubsystemInfo,
 )
-from ..shared.typescript_parser import TypeScriptParser, FunctionInfo
-from ..utils.exception_handler import RuleOf6ExceptionHandler
-from ..utils.file_utils import FileCache, get_file_content, is_test_file
+from ..shared.typescript_parser import FunctionInfo
+from ..utils.exception_handler import RuleOf6Exception, RuleOf6ExceptionHandler
+from ..utils.file_utils import FileCache, is_test_file
 
 
 # Thresholds
@@ -29,6 +31,59 @@ MAX_FUNCTION_LINES_ERROR = 100
 MAX_FUNCTION_ARGS = 6
 MAX_OBJECT_KEYS = 6
 
+# Recommendations shared by every violation of a kind
+_REC_GROUP_SUBSYSTEMS = (
+    "Introduce a router subsystem to group related children. "
+    "Focus on meaningful groupings, not arbitrary splits."
+)
+_REC_SPLIT_FILE = (
+    "Split into multiple files by grouping related functions. "
+    "Prefix internal helpers with '_'."
+)
+_REC_REFACTOR_IMMEDIATELY = (
+    "Immediately refactor into max 6 function calls at the same "
+    "abstraction level. Avoid creating meaningless wrapper functions."
+)
+_REC_BREAK_DOWN_FUNCTION = (
+    "Break down into max 6 smaller functions at the same "
+    "abstraction level. Focus on single responsibility."
+)
+_REC_REDUCE_ARGUMENTS = (
+    f"Use max 3 arguments, or 1 object with max {MAX_OBJECT_KEYS} keys. "
+    "Group related parameters meaningfully."
+)
+_REC_GROUP_OBJECT_KEYS = (
+    "Group related keys into nested objects or split into "
+    "multiple focused parameters with clear semantic meaning."
+)
+
+
+def _is_type_file(file_path: Path) -> bool:
+    """Check if file is a pure type definition file."""
+    name = file_path.name
+    return name == "types.ts" or name == "types.tsx" or "/types/" in str(file_path)
+
+
+@lru_cache(maxsize=None)
+def _is_checked_file(file_path: Path) -> bool:
+    """Whether the file rules apply to a file: neither a test nor a type definition file.
+
+    Memoized, so each path is classified once however many runs or rules ask.
+    """
+    return not is_test_file(file_path) and not _is_type_file(file_path)
+
+
+def _relative_path(file_path: Path, target_prefix: str) -> str:
+    """Path relative to the target directory, given as a prefix ending in a separator.
+
+    A string prefix test instead of Path.relative_to, which raises for
+    every file outside the target.
+    """
+    path_str = str(file_path)
+    if path_str.startswith(target_prefix):
+        return path_str[len(target_prefix):]
+    return path_str
+
 
 class RuleOf6Rules:
     """Implements the four Rule of 6 checks."""
@@ -36,7 +91,6 @@ class RuleOf6Rules:
     def __init__(self, file_cache: FileCache, exception_handler: RuleOf6ExceptionHandler):
         self.file_cache = file_cache
         self.exception_handler = exception_handler
-        self.ts_parser = TypeScriptParser()
 
     # ------------------------------------------------------------------
     # 1. Subsystem count
@@ -55,65 +109,54 @@ class RuleOf6Rules:
                     ),
                     error_type=ErrorType.SUBSYSTEM_COUNT,
                     subsystem=str(subsystem.path),
-                    recommendation=(
-                        "Introduce a router subsystem to group related children. "
-                        "Focus on meaningful groupings, not arbitrary splits."
-                    ),
+                    recommendation=_REC_GROUP_SUBSYSTEMS,
                     recommendation_type=RecommendationType.REDUCE_SUBSYSTEMS,
                 ))
         return errors
 
     # ------------------------------------------------------------------
-    # 2 + 3. File function count, function lines, function arguments
+    # 2 + 3 + 4. File function count, function lines, function arguments,
+    # object parameter keys
     # ------------------------------------------------------------------
 
-    def check_file_functions(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
-        """Check function count, lines, and arguments across all subsystem files."""
-        errors: List[ArchError] = []
+    def check_all_file_rules(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
+        """Check function count, lines, arguments, and object parameter keys across all subsystem files."""
+        function_errors: List[ArchError] = []
+        object_key_errors: List[ArchError] = []
         target_path = self._find_target_path(subsystems)
 
         # Collect all TypeScript files from subsystems
-        all_files: List[Path] = []
-        for subsystem in subsystems:
-            for file_info in subsystem.files:
-                if not is_test_file(file_info.path) and not self._is_type_file(file_info.path):
-                    all_files.append(file_info.path)
-
-        # Process files in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {
-                executor.submit(self._check_single_file, file_path, target_path): file_path
-                for file_path in all_files
-            }
-            for future in as_completed(futures):
-                file_errors = future.result()
-                errors.extend(file_errors)
+        all_files = [
+            file_info.path
+            for file_info in chain.from_iterable(subsystem.files for subsystem in subsystems)
+            if file_info.content and _is_checked_file(file_info.path)
+        ]
 
-        return errors
+        # Each file is parsed once (and cached) for both the function and the
+        # object key checks; large projects are parsed in worker processes
+        self.file_cache.preparse(all_files, MAX_OBJECT_KEYS)
 
-    def _check_single_file(self, file_path: Path, target_path: Path) -> List[ArchError]:
-        """Check a single file for function count, lines, and argument violations."""
-        errors: List[ArchError] = []
-        content = get_file_content(file_path)
-        if not content:
-            return errors
+        # Files under target_path are reported relative to it, others as they are
+        target_prefix = os.path.join(str(target_path), "") if target_path.parts else ""
+
+        for file_path in all_files:
+            functions, violations = self.file_cache.get_parsed_file(file_path, MAX_OBJECT_KEYS)
+            relative_path = _relative_path(file_path, target_prefix)
 
-        functions = self.ts_parser.extract_functions(content, file_path)
+            function_errors.extend(self._check_file_functions(functions, file_path, relative_path))
+            object_key_errors.extend(self._check_object_parameter_keys(violations, relative_path))
 
-        try:
-            relative_path = str(file_path.relative_to(target_path))
-        except ValueError:
-            relative_path = str(file_path)
+        return function_errors + object_key_errors
+
+    def _check_file_functions(self, functions: List[FunctionInfo], file_path: Path, relative_path: str) -> List[ArchError]:
+        """Check a single file for function count, lines, and argument violations."""
+        errors: List[ArchError] = []
 
         # --- Function count per file ---
         file_exception = self.exception_handler.get_file_exception(file_path)
         file_threshold = file_exception.threshold if file_exception else MAX_FUNCTIONS_PER_FILE
 
         if len(functions) > file_threshold:
-            func_names = [f.name for f in functions[:8]]
-            if len(functions) > 8:
-                func_names.append("...")
-
             if file_exception:
                 message = f"File '{relative_path}' has {len(functions)} functions (custom limit {file_threshold})"
             else:
@@ -123,28 +166,34 @@ class RuleOf6Rules:
                 message=message,
                 error_type=ErrorType.FILE_FUNCTIONS,
                 file_path=relative_path,
-                recommendation=(
-                    "Split into multiple files by grouping related functions. "
-                    "Prefix internal helpers with '_'."
-                ),
+                recommendation=_REC_SPLIT_FILE,
                 recommendation_type=RecommendationType.REDUCE_FUNCTIONS,
             ))
 
         # --- Per-function checks ---
+        function_rules = self.exception_handler.get_function_exceptions_for_file(
+            relative_path, (func.name for func in functions)
+        )
+        # One pass over the functions; the warning builders are only called
+        # for functions that cross a threshold
         for func in functions:
-            errors.extend(self._check_function_lines(func, relative_path))
-            errors.extend(self._check_function_arguments(func, relative_path))
+            custom_rule = function_rules.get(func.name)
+            if custom_rule or func.line_count > MAX_FUNCTION_LINES_WARNING:
+                lines_warning = self._function_lines_warning(func, relative_path, custom_rule)
+                if lines_warning:
+                    errors.append(lines_warning)
+            if func.arg_count > MAX_FUNCTION_ARGS:
+                errors.append(self._function_arguments_warning(func, relative_path))
 
         return errors
 
-    def _check_function_lines(self, func: FunctionInfo, relative_path: str) -> List[ArchError]:
+    def _function_lines_warning(
+        self, func: FunctionInfo, relative_path: str, custom_rule: Optional[RuleOf6Exception]
+    ) -> Optional[ArchError]:
         """Check function line count with custom threshold support."""
-        errors: List[ArchError] = []
-        custom_rule = self.exception_handler.get_function_exception(relative_path, func.name)
-
         if custom_rule:
             if func.line_count > custom_rule.threshold:
-                errors.append(ArchError.create_warning(
+                return ArchError.create_warning(
                     message=(
                         f"Function '{func.name}' has {func.line_count} lines "
                         f"(custom limit {custom_rule.threshold})"
@@ -157,10 +206,10 @@ class RuleOf6Rules:
                         f"Justification: {custom_rule.justification}"
                     ),
                     recommendation_type=RecommendationType.REDUCE_FUNCTION_LINES,
-                ))
+                )
         elif func.line_count > MAX_FUNCTION_LINES_WARNING:
             if func.line_count >= MAX_FUNCTION_LINES_ERROR:
-                errors.append(ArchError.create_warning(
+                return ArchError.create_warning(
                     message=(
                         f"Function '{func.name}' has {func.line_count} lines "
                         f"(enforced max {MAX_FUNCTION_LINES_ERROR})"
@@ -168,104 +217,58 @@ class RuleOf6Rules:
                     error_type=ErrorType.FUNCTION_LINES,
                     file_path=relative_path,
                     line_number=func.line_start,
-                    recommendation=(
-                        "Immediately refactor into max 6 function calls at the same "
-                        "abstraction level. Avoid creating meaningless wrapper functions."
-                    ),
-                    recommendation_type=RecommendationType.REDUCE_FUNCTION_LINES,
-                ))
-            else:
-                errors.append(ArchError.create_warning(
-                    message=(
-                        f"Function '{func.name}' has {func.line_count} lines "
-                        f"(recommended max {MAX_FUNCTION_LINES_WARNING})"
-                    ),
-                    error_type=ErrorType.FUNCTION_LINES,
-                    file_path=relative_path,
-                    line_number=func.line_start,
-                    recommendation=(
-                        "Break down into max 6 smaller functions at the same "
-                        "abstraction level. Focus on single responsibility."
-                    ),
+                    recommendation=_REC_REFACTOR_IMMEDIATELY,
                     recommendation_type=RecommendationType.REDUCE_FUNCTION_LINES,
-                ))
-
-        return errors
-
-    def _check_function_arguments(self, func: FunctionInfo, relative_path: str) -> List[ArchError]:
-        """Check function argument count."""
+                )
+            return ArchError.create_warning(
+                message=(
+                    f"Function '{func.name}' has {func.line_count} lines "
+                    f"(recommended max {MAX_FUNCTION_LINES_WARNING})"
+                ),
+                error_type=ErrorType.FUNCTION_LINES,
+                file_path=relative_path,
+                line_number=func.line_start,
+                recommendation=_REC_BREAK_DOWN_FUNCTION,
+                recommendation_type=RecommendationType.REDUCE_FUNCTION_LINES,
+            )
+
+        return None
+
+    def _function_arguments_warning(self, func: FunctionInfo, relative_path: str) -> ArchError:
+        """Build the warning for a function with too many arguments."""
+        return ArchError.create_warning(
+            message=(
+                f"Function '{func.name}' has {func.arg_count} arguments "
+                f"(max {MAX_FUNCTION_ARGS})"
+            ),
+            error_type=ErrorType.FUNCTION_ARGS,
+            file_path=relative_path,
+            line_number=func.line_start,
+            recommendation=_REC_REDUCE_ARGUMENTS,
+            recommendation_type=RecommendationType.REDUCE_FUNCTION_ARGS,
+        )
+
+    def _check_object_parameter_keys(self, violations: List[Tuple[int, int, str]], relative_path: str) -> List[ArchError]:
+        """Check object parameters have max 6 keys."""
         errors: List[ArchError] = []
-        if func.arg_count > MAX_FUNCTION_ARGS:
+        for line_num, key_count, params_preview in violations:
             errors.append(ArchError.create_warning(
                 message=(
-                    f"Function '{func.name}' has {func.arg_count} arguments "
-                    f"(max {MAX_FUNCTION_ARGS})"
+                    f"Object parameter has {key_count} keys "
+                    f"(max {MAX_OBJECT_KEYS})"
                 ),
                 error_type=ErrorType.FUNCTION_ARGS,
                 file_path=relative_path,
-                line_number=func.line_start,
-                recommendation=(
-                    f"Use max 3 arguments, or 1 object with max {MAX_OBJECT_KEYS} keys. "
-                    "Group related parameters meaningfully."
-                ),
+                line_number=line_num,
+                recommendation=_REC_GROUP_OBJECT_KEYS,
                 recommendation_type=RecommendationType.REDUCE_FUNCTION_ARGS,
             ))
         return errors
 
-    # ------------------------------------------------------------------
-    # 4. Object parameter keys
-    # ------------------------------------------------------------------
-
-    def check_object_parameter_keys(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
-        """Check object parameters have max 6 keys."""
-        errors: List[ArchError] = []
-        target_path = self._find_target_path(subsystems)
-
-        for subsystem in subsystems:
-            for file_info in subsystem.files:
-                if is_test_file(file_info.path) or self._is_type_file(file_info.path):
-                    continue
-                content = get_file_content(file_info.path)
-                if not content:
-                    continue
-
-                violations = self.ts_parser.find_object_parameter_violations(
-                    content, file_info.path, MAX_OBJECT_KEYS
-                )
-
-                try:
-                    relative_path = str(file_info.path.relative_to(target_path))
-                except ValueError:
-                    relative_path = str(file_info.path)
-
-                for line_num, key_count, params_preview in violations:
-                    errors.append(ArchError.create_warning(
-                        message=(
-                            f"Object parameter has {key_count} keys "
-                            f"(max {MAX_OBJECT_KEYS})"
-                        ),
-                        error_type=ErrorType.FUNCTION_ARGS,
-                        file_path=relative_path,
-                        line_number=line_num,
-                        recommendation=(
-                            "Group related keys into nested objects or split into "
-                            "multiple focused parameters with clear semantic meaning."
-                        ),
-                        recommendation_type=RecommendationType.REDUCE_FUNCTION_ARGS,
-                    ))
-
-        return errors
-
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _is_type_file(file_path: Path) -> bool:
-        """Check if file is a pure type definition file."""
-        name = file_path.name
-        return name == "types.ts" or name == "types.tsx" or "/types/" in str(file_path)
-
     @staticmethod
     def _find_target_path(subsystems: List[SubsystemInfo]) -> Path:
         """Derive the common target path from subsystems."""
@@ -13,6 +13,13 @@ from ..models import ArchError, ErrorType, RecommendationType, SubsystemInfo
 from ..utils.path_utils import PathHelper
 
 
+# HTTP methods a route.ts file can export handlers for
+_HTTP_METHODS = ("GET", "POST", "PUT", "DELETE")
+
+# Directly exported (unwrapped) route handler functions
+_ROUTE_METHOD_RE = re.compile(r"export\s+(?:async\s+)?function\s+(GET|POST|PUT|DELETE)\b")
+
+
 class ApiRuleChecker:
     """Checker for API route logging rules."""
 
@@ -29,8 +36,11 @@ class ApiRuleChecker:
             if s.subsystem_type == "api" and not self._is_boundary_subsystem(s)
         ]
 
+        if api_subsystems:
+            self.file_cache.index_tree(self.path_helper.target_path)
+
         for subsystem in api_subsystems:
-            route_files = list(subsystem.path.rglob("route.ts"))
+            route_files = self.file_cache.files_named("route.ts", under=subsystem.path)
             for route_file in route_files:
                 errors.extend(self._check_route_file(route_file, subsystem))
 
@@ -47,10 +57,11 @@ class ApiRuleChecker:
         if not content:
             return errors
 
-        http_methods = ["GET", "POST", "PUT", "DELETE"]
-        exported_methods = re.findall(
-            r"export\s+(?:async\s+)?function\s+(GET|POST|PUT|DELETE)\b", content
-        )
+        # Substring checks rule out most files before the regex has to run
+        if "export" not in content or not any(method in content for method in _HTTP_METHODS):
+            return errors
+
+        exported_methods = _ROUTE_METHOD_RE.findall(content)
 
         if not exported_methods:
             return errors
@@ -8,11 +8,15 @@ Handles Next.js app directory specific rules:
 - Page.tsx detection: folders with page.tsx must be subsystems
 """
 
+import os
 import re
+from itertools import chain
 from pathlib import Path
-from typing import List
+from typing import List, Set
 
 from ..models import ArchError, ErrorType, RecommendationType, SubsystemInfo
+from ..utils.file_utils import scan_directory
+from ..utils.import_utils import path_boundary_prefixes
 from ..utils.path_utils import PathHelper
 
 
@@ -31,19 +35,21 @@ class AppPageRuleChecker:
         if not app_dir.exists():
             return errors
 
+        # Subfolders with a page.tsx anywhere below them, from one pass over the index
+        subfolders_with_pages = self._subfolders_with_page_tsx(app_dir)
+
         # Find all direct subfolders of src/app
-        for subfolder in app_dir.iterdir():
-            if not subfolder.is_dir():
+        for entry in scan_directory(app_dir):
+            if not entry.is_dir():
                 continue
 
             # Skip if starts with underscore (private folders) or dot
-            if subfolder.name.startswith('_') or subfolder.name.startswith('.'):
+            if entry.name.startswith('_') or entry.name.startswith('.'):
                 continue
 
             # Check if this folder or any of its subfolders has page.tsx
-            has_page_tsx = self._has_page_tsx_recursive(subfolder)
-
-            if has_page_tsx:
+            if entry.name in subfolders_with_pages:
+                subfolder = Path(entry.path)
                 # Check if it has dependencies.json (is a subsystem)
                 deps_file = subfolder / "dependencies.json"
                 if not deps_file.exists():
@@ -67,17 +73,19 @@ class AppPageRuleChecker:
 
         # Check all TypeScript files, not just those in subsystems
         # This catches violations in non-subsystem directories like test-utils
-        from ..utils.file_utils import find_typescript_files
-
-        all_files = find_typescript_files(self.path_helper.target_path)
+        all_files = self.file_cache.typescript_files(self.path_helper.target_path)
+        app_prefix = os.path.join(str(app_dir), "")
 
         for ts_file in all_files:
-            # Skip if file is inside app directory
-            try:
-                ts_file.relative_to(app_dir)
-                continue  # File is inside app, skip it
-            except ValueError:
-                pass  # File is outside app, check it
+            # Skip if file is inside app directory (a string prefix test,
+            # where relative_to would raise for every file outside it)
+            if str(ts_file).startswith(app_prefix):
+                continue
+
+            # Only a file mentioning ~/app can import from it; checking the raw
+            # content first spares decoding and parsing all other files
+            if not self.file_cache.file_contains(ts_file, "~/app"):
+                continue
 
             # Check this file for app imports
             file_info = self.file_cache.get_file_info(ts_file)
@@ -120,21 +128,28 @@ class AppPageRuleChecker:
                 subsystem_path = f"~/{subsystem.path.relative_to(Path('src'))}".rstrip('/')
                 page_subsystems[subsystem_path] = subsystem
 
+        # Any page import starts with one of these; built once so most imports
+        # are rejected by a single C-level startswith call
+        page_prefixes = tuple(path + "/" for path in page_subsystems)
+
         # Check each page subsystem
         for page_path, page_subsystem in page_subsystems.items():
+            # Imports are taken verbatim from the content, so a file can only
+            # import from another page if it contains that page's path
+            other_page_paths = [path for path in page_subsystems if path != page_path]
             for file_info in page_subsystem.files:
+                if not any(path in file_info.content for path in other_page_paths):
+                    continue
                 for import_path in file_info.imports:
                     # Normalize import path
                     normalized_import = import_path.rstrip('/')
+                    if normalized_import not in page_subsystems and not normalized_import.startswith(page_prefixes):
+                        continue
 
-                    # Check if importing from another page
-                    for other_page_path, other_page in page_subsystems.items():
-                        if other_page_path == page_path:
-                            continue  # Skip self
-
-                        # Check for path boundary: exact match or starts with path + separator
-                        if (normalized_import == other_page_path or
-                            normalized_import.startswith(other_page_path + "/")):
+                    # Check if importing from another page: a page matches when it is the
+                    # import path itself or one of its prefixes ending at a separator
+                    for other_page_path in chain((normalized_import,), path_boundary_prefixes(normalized_import)):
+                        if other_page_path != page_path and other_page_path in page_subsystems:
                             errors.append(ArchError.create_error(
                                 message=(f"❌ Page isolation violation in {page_subsystem.name}:\n"
                                        f"  🔸 {file_info.path.relative_to(page_subsystem.path)}\n"
@@ -149,25 +164,18 @@ class AppPageRuleChecker:
 
         return errors
 
-    def _has_page_tsx_recursive(self, directory: Path, max_depth: int = 3) -> bool:
-        """Check if directory or any subdirectory has page.tsx (up to max_depth)."""
-        def search(path: Path, current_depth: int = 0) -> bool:
-            if current_depth > max_depth:
-                return False
-
-            # Check current directory
-            if (path / "page.tsx").exists():
-                return True
+    def _subfolders_with_page_tsx(self, app_dir: Path, max_depth: int = 3) -> Set[str]:
+        """Names of the direct subfolders of app_dir that have a page.tsx in them or below (up to max_depth)."""
+        # Look the page.tsx files up in the file cache's tree index instead of
+        # walking each subfolder; hidden directories are not searched
+        self.file_cache.index_tree(self.path_helper.target_path)
 
-            # Check subdirectories
-            try:
-                for subdir in path.iterdir():
-                    if subdir.is_dir() and not subdir.name.startswith('.'):
-                        if search(subdir, current_depth + 1):
-                            return True
-            except PermissionError:
-                pass
-
-            return False
-
-        return search(directory)
+        subfolders: Set[str] = set()
+        for page_file in self.file_cache.files_named("page.tsx", under=app_dir):
+            folders = page_file.parent.relative_to(app_dir).parts
+            if not folders or folders[0] in subfolders:
+                continue
+            nested = folders[1:]
+            if len(nested) <= max_depth and not any(folder.startswith('.') for folder in nested):
+                subfolders.add(folders[0])
+        return subfolders
@@ -5,14 +5,40 @@ Complexity-based architecture rules.
 Handles checking for complexity-based documentation requirements.
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import List
+from typing import Container, Dict, FrozenSet, List, Optional, Tuple
 
 from ..models import ArchError, ErrorType, RecommendationType, SubsystemInfo
-from ..utils.file_utils import count_typescript_lines
+from ..utils.file_utils import count_typescript_lines, scan_directory
 from ..utils.path_utils import PathHelper
 
 
+# Files every complex directory and subsystem needs, in reporting order
+# (ARCHITECTURE.md no longer required - consolidated into README.md)
+_REQUIRED_SUBSYSTEM_FILES = ("dependencies.json", "README.md")
+
+# Recommendation for each possible list of missing required files, formatted
+# with the directory
+_MISSING_FILES_RECOMMENDATIONS = {
+    ("README.md",): (
+        RecommendationType.CREATE_README,
+        "ERROR: Create {directory}/README.md file (follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)",
+    ),
+    **{
+        missing: (
+            RecommendationType.CREATE_SUBSYSTEM_FILES,
+            "ERROR: Create missing files in {directory}: " + ", ".join(missing)
+            + " (for README.md follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)",
+        )
+        for missing in [("dependencies.json",), ("dependencies.json", "README.md")]
+    },
+}
+
+
 class ComplexityRuleChecker:
     """Checker for complexity-based documentation requirements."""
     
@@ -24,140 +50,185 @@ class ComplexityRuleChecker:
         self.exception_handler = exception_handler
         self.complexity_threshold = complexity_threshold
         self.doc_threshold = doc_threshold
+        # Custom doc thresholds scale the custom complexity threshold by this ratio
+        self._doc_ratio = doc_threshold / complexity_threshold
+        # Subsystems declared by each parent directory, per complexity check run
+        self._declared_subsystems_cache: Dict[Path, Container[str]] = {}
+        # TypeScript line counts per directory, per complexity check run
+        self._line_counts: Dict[Path, int] = {}
+        # Custom thresholds per directory; subsystems are also checked as directories
+        self._custom_thresholds_cache: Dict[Path, dict] = {}
+        self._custom_thresholds_lock = threading.Lock()
     
-    def check_complexity_requirements(self) -> List[ArchError]:
-        """Check directories for complexity-based documentation requirements."""
-        errors = []
+    def check_all(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
+        """Run the complexity requirement and subsystem completeness checks in one pass.
+        
+        Subsystems are directories too, so both checks ask for the custom
+        thresholds and required files of mostly the same paths; running them
+        together on one thread pool answers each of those lookups once.
+        Errors come in the same order as from calling both checks in turn.
+        """
         # print("Scanning directories for complexity requirements...")
         
+        self._declared_subsystems_cache.clear()
+        self._line_counts.clear()
         directories_to_check = self.path_helper.get_directories_to_check()
         
-        for directory in directories_to_check:
-            if not directory.is_dir():
-                continue
+        # Directories are independent of each other and their checks are
+        # mostly stat and read calls, which release the GIL; map keeps the
+        # results in directory (and subsystem) order
+        with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as executor:
+            directory_results = executor.map(self._check_directory_complexity, directories_to_check)
+            subsystem_results = executor.map(self._check_subsystem_completeness, subsystems)
+            results = list(chain(directory_results, subsystem_results))
+        
+        return [error for error in results if error]
+    
+    def check_complexity_requirements(self) -> List[ArchError]:
+        """Check directories for complexity-based documentation requirements."""
+        return self.check_all([])
+    
+    def _check_directory_complexity(self, directory: Path) -> Optional[ArchError]:
+        """Check one directory for complexity-based documentation requirements."""
+        if not directory.is_dir():
+            return None
                 
-            # Skip directories that should not be traversed at all
-            if self.path_helper.is_traversal_exception(directory):
-                continue
+        # Skip directories that should not be traversed at all
+        if self.path_helper.is_traversal_exception(directory):
+            return None
             
-            # Skip if parent is already a subsystem AND this directory is declared as a subsystem
-            if self._is_declared_child_subsystem(directory, self.file_cache):
-                continue
+        # Skip if parent is already a subsystem AND this directory is declared as a subsystem
+        if self._is_declared_child_subsystem(directory, self.file_cache):
+            return None
             
-            lines = count_typescript_lines(directory)
+        # A parent's count already counts its non-subsystem children, so
+        # counts are shared between directories
+        lines = count_typescript_lines(directory, self._line_counts)
             
-            # Only apply architecture requirements if directory is NOT a rule exception
-            if not self.path_helper.is_rule_exception(directory):
-                # Check for custom thresholds from exception files
-                custom_thresholds = self._get_custom_thresholds(directory)
-                complexity_threshold = custom_thresholds.get("complexity", self.complexity_threshold)
-                doc_threshold = custom_thresholds.get("doc", self.doc_threshold)
-                exception_info = custom_thresholds.get("exception_info")
+        # Only apply architecture requirements if directory is NOT a rule exception
+        if not self.path_helper.is_rule_exception(directory):
+            # Check for custom thresholds from exception files
+            custom_thresholds = self._get_custom_thresholds(directory)
+            complexity_threshold = custom_thresholds.get("complexity", self.complexity_threshold)
+            doc_threshold = custom_thresholds.get("doc", self.doc_threshold)
+            exception_info = custom_thresholds.get("exception_info")
                 
-                if lines > complexity_threshold:
-                    # Complex folder needs full subsystem structure
-                    missing = self._get_missing_subsystem_files(directory)
+            if lines > complexity_threshold:
+                # Complex folder needs full subsystem structure
+                missing = self._get_missing_subsystem_files(directory)
                     
-                    if missing:
-                        threshold_msg = f" (custom threshold {complexity_threshold})" if exception_info else ""
-                        recommendation = f"ERROR: Create {directory}/README.md file (follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)" if missing == ["README.md"] else f"ERROR: Create missing files in {directory}: {', '.join(missing)} (for README.md follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)"
+                if missing:
+                    threshold_msg = f" (custom threshold {complexity_threshold})" if exception_info else ""
+                    rec_type, recommendation = self._missing_files_recommendation(directory, missing)
+                    error = ArchError.create_error(
+                        message=f"❌ {directory} ({lines} lines){threshold_msg} missing: {' '.join(missing)}",
+                        error_type=ErrorType.COMPLEXITY,
+                        subsystem=str(directory),
+                        recommendation=recommendation,
+                        recommendation_type=rec_type
+                    )
                         
-                        rec_type = RecommendationType.CREATE_README if missing == ["README.md"] else RecommendationType.CREATE_SUBSYSTEM_FILES
-                        error = ArchError.create_error(
-                            message=f"❌ {directory} ({lines} lines){threshold_msg} missing: {' '.join(missing)}",
-                            error_type=ErrorType.COMPLEXITY,
-                            subsystem=str(directory),
-                            recommendation=recommendation,
-                            recommendation_type=rec_type
-                        )
+                    # Add exception info for reporting
+                    if exception_info:
+                        error.metadata = {
+                            "custom_threshold": complexity_threshold,
+                            "default_threshold": self.complexity_threshold,
+                            "exception_source": exception_info.get("exception_source"),
+                            "justification": exception_info.get("justification")
+                        }
                         
-                        # Add exception info for reporting
-                        if exception_info:
-                            error.metadata = {
-                                "custom_threshold": complexity_threshold,
-                                "default_threshold": self.complexity_threshold,
-                                "exception_source": exception_info.get("exception_source"),
-                                "justification": exception_info.get("justification")
-                            }
-                        
-                        errors.append(error)
+                    return error
                 
-                elif lines > doc_threshold:
-                    # Medium complexity needs README
-                    if not (directory / "README.md").exists():
-                        threshold_msg = f" (custom threshold {doc_threshold})" if exception_info else ""
+            elif lines > doc_threshold:
+                # Medium complexity needs README
+                if "README.md" not in self._directory_names(directory):
+                    threshold_msg = f" (custom threshold {doc_threshold})" if exception_info else ""
                         
-                        warning = ArchError.create_warning(
-                            message=f"⚠️  {directory} ({lines} lines){threshold_msg} - missing README.md",
-                            error_type=ErrorType.COMPLEXITY,
-                            subsystem=str(directory),
-                            recommendation=f"WARNING: Create {directory}/README.md file (follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)",
-                            recommendation_type=RecommendationType.CREATE_README
-                        )
+                    warning = ArchError.create_warning(
+                        message=f"⚠️  {directory} ({lines} lines){threshold_msg} - missing README.md",
+                        error_type=ErrorType.COMPLEXITY,
+                        subsystem=str(directory),
+                        recommendation=f"WARNING: Create {directory}/README.md file (follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)",
+                        recommendation_type=RecommendationType.CREATE_README
+                    )
                         
-                        # Add exception info for reporting
-                        if exception_info:
-                            warning.metadata = {
-                                "custom_threshold": doc_threshold,
-                                "default_threshold": self.doc_threshold,
-                                "exception_source": exception_info.get("exception_source"),
-                                "justification": exception_info.get("justification")
-                            }
+                    # Add exception info for reporting
+                    if exception_info:
+                        warning.metadata = {
+                            "custom_threshold": doc_threshold,
+                            "default_threshold": self.doc_threshold,
+                            "exception_source": exception_info.get("exception_source"),
+                            "justification": exception_info.get("justification")
+                        }
                         
-                        errors.append(warning)
+                    return warning
         
-        return errors
+        return None
     
     def check_subsystem_completeness(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
         """Check that subsystems have all required files."""
-        errors = []
         # print("Checking subsystems for completeness...")
-        
-        for subsystem in subsystems:
-            # Check for custom thresholds from exception files
-            custom_thresholds = self._get_custom_thresholds(subsystem.path)
-            complexity_threshold = custom_thresholds.get("complexity", self.complexity_threshold)
-            exception_info = custom_thresholds.get("exception_info")
+        results = [self._check_subsystem_completeness(subsystem) for subsystem in subsystems]
+        return [error for error in results if error]
+    
+    def _check_subsystem_completeness(self, subsystem: SubsystemInfo) -> Optional[ArchError]:
+        """Check that one subsystem has all required files."""
+        # Check for custom thresholds from exception files
+        custom_thresholds = self._get_custom_thresholds(subsystem.path)
+        complexity_threshold = custom_thresholds.get("complexity", self.complexity_threshold)
+        exception_info = custom_thresholds.get("exception_info")
             
-            # Only require documentation for complex subsystems (over threshold)
-            if subsystem.total_lines <= complexity_threshold:
-                continue
+        # Only require documentation for complex subsystems (over threshold)
+        if subsystem.total_lines <= complexity_threshold:
+            return None
                 
-            missing = self._get_missing_subsystem_files(subsystem.path)
+        missing = self._get_missing_subsystem_files(subsystem.path)
             
-            if missing:
-                threshold_msg = f" (custom threshold {complexity_threshold})" if exception_info else ""
-                recommendation = f"ERROR: Create {subsystem.path}/README.md file (follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)" if missing == ["README.md"] else f"ERROR: Create missing files in {subsystem.path}: {', '.join(missing)} (for README.md follow guidelines in scripts/checks/architecture/README-STRUCTURE.md)"
+        if missing:
+            threshold_msg = f" (custom threshold {complexity_threshold})" if exception_info else ""
+            rec_type, recommendation = self._missing_files_recommendation(subsystem.path, missing)
+            error = ArchError.create_error(
+                message=(f"❌ Subsystem {subsystem.path} ({subsystem.total_lines} lines){threshold_msg} "
+                       f"missing: {' '.join(missing)}"),
+                error_type=ErrorType.SUBSYSTEM_STRUCTURE,
+                subsystem=str(subsystem.path),
+                recommendation=recommendation,
+                recommendation_type=rec_type
+            )
                 
-                rec_type = RecommendationType.CREATE_README if missing == ["README.md"] else RecommendationType.CREATE_SUBSYSTEM_FILES
-                error = ArchError.create_error(
-                    message=(f"❌ Subsystem {subsystem.path} ({subsystem.total_lines} lines){threshold_msg} "
-                           f"missing: {' '.join(missing)}"),
-                    error_type=ErrorType.SUBSYSTEM_STRUCTURE,
-                    subsystem=str(subsystem.path),
-                    recommendation=recommendation,
-                    recommendation_type=rec_type
-                )
+            # Add exception info for reporting
+            if exception_info:
+                error.metadata = {
+                    "custom_threshold": complexity_threshold,
+                    "default_threshold": self.complexity_threshold,
+                    "exception_source": exception_info.get("exception_source"),
+                    "justification": exception_info.get("justification")
+                }
                 
-                # Add exception info for reporting
-                if exception_info:
-                    error.metadata = {
-                        "custom_threshold": complexity_threshold,
-                        "default_threshold": self.complexity_threshold,
-                        "exception_source": exception_info.get("exception_source"),
-                        "justification": exception_info.get("justification")
-                    }
-                
-                errors.append(error)
+            return error
         
-        return errors
+        return None
     
     def _is_declared_child_subsystem(self, directory: Path, file_cache=None) -> bool:
         """Check if directory is a declared child subsystem of its parent."""
         parent = directory.parent
-        if parent == directory or not (parent / "dependencies.json").exists():
+        if parent == directory:
             return False
         
+        # Siblings share the parent's declarations, loaded once per parent
+        declared_subsystems = self._declared_subsystems_cache.get(parent)
+        if declared_subsystems is None:
+            declared_subsystems = self._load_declared_subsystems(parent, file_cache)
+            self._declared_subsystems_cache[parent] = declared_subsystems
+        
+        # Only skip if this directory is properly declared as a subsystem
+        return f"./{directory.name}" in declared_subsystems
+    
+    def _load_declared_subsystems(self, parent: Path, file_cache=None) -> Container[str]:
+        """Subsystems declared in a directory's dependencies.json (empty if it has none)."""
+        if "dependencies.json" not in self._directory_names(parent):
+            return frozenset()
+        
         # Use provided file cache or create temporary one
         if file_cache:
             parent_deps = file_cache.load_dependencies_json(parent / "dependencies.json")
@@ -170,28 +241,44 @@ class ComplexityRuleChecker:
                 parent_deps = {}
         
         subsystems_array = parent_deps.get("subsystems", [])
-        relative_path = f"./{directory.name}"
-        
-        # Only skip if this directory is properly declared as a subsystem
-        return relative_path in subsystems_array
+        if isinstance(subsystems_array, list):
+            return frozenset(name for name in subsystems_array if isinstance(name, str))
+        return subsystems_array
     
     def _get_missing_subsystem_files(self, directory: Path) -> List[str]:
         """Get list of missing required files for a subsystem."""
-        missing = []
-        
-        if not (directory / "dependencies.json").exists():
-            missing.append("dependencies.json")
-        if not (directory / "README.md").exists():
-            missing.append("README.md")
-        # ARCHITECTURE.md no longer required - consolidated into README.md
-        
-        return missing
+        names = self._directory_names(directory)
+        return [name for name in _REQUIRED_SUBSYSTEM_FILES if name not in names]
+    
+    @staticmethod
+    def _missing_files_recommendation(directory: Path, missing: List[str]) -> Tuple[RecommendationType, str]:
+        """Recommendation type and text for a directory missing required files."""
+        rec_type, template = _MISSING_FILES_RECOMMENDATIONS[tuple(missing)]
+        return rec_type, template.format(directory=directory)
+    
+    def _directory_names(self, directory: Path) -> FrozenSet[str]:
+        """Names of a directory's entries, from the file cache when there is one."""
+        if self.file_cache:
+            return self.file_cache.get_directory_names(directory)
+        return frozenset(entry.name for entry in scan_directory(directory))
     
     def _get_custom_thresholds(self, directory: Path) -> dict:
-        """Get custom thresholds for a directory from exception files."""
+        """Get custom thresholds for a directory from exception files (cached per directory)."""
         if not self.exception_handler:
             return {}
         
+        cached = self._custom_thresholds_cache.get(directory)
+        if cached is None:
+            # Directories are checked from several threads; the exception
+            # handler reports problems in an exception file when loading it,
+            # which must happen once
+            with self._custom_thresholds_lock:
+                cached = self._load_custom_thresholds(directory)
+            self._custom_thresholds_cache[directory] = cached
+        return cached
+    
+    def _load_custom_thresholds(self, directory: Path) -> dict:
+        """Look up the custom thresholds of a directory in the exception handler."""
         exception = self.exception_handler.get_custom_threshold(directory)
         if not exception:
             return {}
@@ -201,8 +288,7 @@ class ComplexityRuleChecker:
         custom_threshold = exception.threshold
         
         # Scale the doc threshold proportionally
-        doc_ratio = self.doc_threshold / self.complexity_threshold
-        custom_doc_threshold = int(custom_threshold * doc_ratio)
+        custom_doc_threshold = int(custom_threshold * self._doc_ratio)
         
         return {
             "complexity": custom_threshold,
@@ -5,21 +5,87 @@ Domain-specific architecture rules.
 Handles checking domain structure and import restrictions.
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..models import ArchError, ErrorType, RecommendationType
-from ..utils.file_utils import find_typescript_files
+from ..utils.file_utils import scan_directory
 from ..utils.path_utils import PathHelper
 
 
+# Directory that '~/' import paths are relative to
+_IMPORT_ROOT = Path("src")
+
+# Import path prefix of the domains, and their path relative to the target
+_DOMAIN_IMPORT_PREFIX = "~/lib/domains/"
+_DOMAIN_PATH_PREFIX = "lib/domains/"
+
+# A file that may import services: its path, relative path, import
+# specifiers and the domains it lies in (see _path_domains)
+_ImportingFile = Tuple[Path, str, Set[str], Dict[str, bool]]
+
+# Parts of another domain that must not be imported (anything but its utils)
+_FORBIDDEN_DOMAIN_PARTS = ("services", "infrastructure", "_", "index")
+
+# Quoted text after `from ` (to the end of the content if the quote is not
+# closed); matched in a lookahead so that a `from ` inside it is found too
+_FROM_SPECIFIER_RE = re.compile(r"""from (?=('[^']*'?|"[^"]*"?))""")
+
+
+def _from_specifiers(content: str) -> Set[str]:
+    """Quoted text after each `from ` in content, from the opening quote up to and including the closing one.
+
+    One pass over the content answers every import pattern check: `from 'X'`
+    occurs iff "'X'" is a specifier, and `from 'P` (no closing quote) occurs
+    iff a specifier starts with "'P".
+    """
+    return set(_FROM_SPECIFIER_RE.findall(content))
+
+
+def _path_domains(file_path: str) -> Dict[str, bool]:
+    """Domains a relative path lies in, by each 'lib/domains/<name>/' in it, mapped to whether it is in their services.
+
+    Classifies a file for every domain at once: 'lib/domains/<name>/' occurs
+    in the path iff name is a key, and 'lib/domains/<name>/services' iff its
+    value is true.
+    """
+    domains: Dict[str, bool] = {}
+    start = file_path.find(_DOMAIN_PATH_PREFIX)
+    while start != -1:
+        domain_name, separator, rest = file_path[start + len(_DOMAIN_PATH_PREFIX):].partition("/")
+        if separator:
+            domains[domain_name] = domains.get(domain_name, False) or rest.startswith("services")
+        start = file_path.find(_DOMAIN_PATH_PREFIX, start + 1)
+    return domains
+
+
+def _forbidden_domain_imports(specifiers: Set[str]) -> Set[str]:
+    """Names of the domains whose non-utils parts (see _FORBIDDEN_DOMAIN_PARTS) the specifiers import from.
+
+    Each specifier is classified once by the domain name in its path, rather
+    than tested against the import prefixes of every other domain.
+    """
+    domains = set()
+    for specifier in specifiers:
+        if not specifier.startswith(_DOMAIN_IMPORT_PREFIX, 1):
+            continue
+        domain_name, separator, rest = specifier[len(_DOMAIN_IMPORT_PREFIX) + 1:].partition("/")
+        if separator and rest.startswith(_FORBIDDEN_DOMAIN_PARTS):
+            domains.add(domain_name)
+    return domains
+
+
 class DomainRuleChecker:
     """Checker for domain-specific architecture rules."""
     
     def __init__(self, path_helper: PathHelper, file_cache):
         self.path_helper = path_helper
         self.file_cache = file_cache
+        # Import specifiers by file content, per import restriction check run
+        self._specifiers_by_content: Dict[str, Set[str]] = {}
     
     def check_domain_structure(self) -> List[ArchError]:
         """Check domain-specific structure requirements."""
@@ -30,6 +96,10 @@ class DomainRuleChecker:
         if not domains_path.exists():
             return errors
 
+        # Infrastructure directories of all domains, from the shared tree index
+        self.file_cache.index_tree(self.path_helper.target_path)
+        infrastructure_dirs = self._find_infrastructure_dirs(domains_path)
+
         for domain_dir in domains_path.iterdir():
             if not domain_dir.is_dir():
                 continue
@@ -38,7 +108,7 @@ class DomainRuleChecker:
             errors.extend(self._check_services_structure(domain_dir))
 
             # Check infrastructure structure
-            errors.extend(self._check_infrastructure_structure(domain_dir))
+            errors.extend(self._check_infrastructure_structure(infrastructure_dirs.get(domain_dir.name, [])))
 
             # Check utils structure
             errors.extend(self._check_utils_structure(domain_dir))
@@ -63,23 +133,73 @@ class DomainRuleChecker:
             if service_file.name != "index.ts":
                 service_files.append(service_file)
         
+        # One walk of the target tree serves both the service and the
+        # cross-domain import checks
+        self.file_cache.index_tree(self.path_helper.target_path)
+        self._specifiers_by_content.clear()
+        
+        # Files that may import a service with their relative paths and import
+        # specifiers, collected once for all service files
+        importing_files = []
+        if service_files:
+            typescript_files = self.file_cache.typescript_files(self.path_helper.target_path)
+            # Mostly file reads, which release the GIL; map keeps the file order
+            with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as executor:
+                for importing_file in executor.map(self._importing_file_entry, typescript_files):
+                    if importing_file:
+                        importing_files.append(importing_file)
+        
         # Check each service file for improper imports
         for service_file in service_files:
-            errors.extend(self._check_refined_service_import_violations(service_file))
+            errors.extend(self._check_refined_service_import_violations(service_file, importing_files))
         
         # Check cross-domain imports (no domain should import other domain services/non-utils)
         errors.extend(self._check_cross_domain_violations())
         
         return errors
     
+    def _importing_file_entry(self, ts_file: Path) -> Optional[_ImportingFile]:
+        """A file with its relative path, import specifiers and domains, if it may import a service."""
+        # API/server files are always allowed to import services
+        file_str = str(ts_file)
+        if "/api/" in file_str or "/server/" in file_str:
+            return None
+        # Every service import path has a services directory in it;
+        # files outside subsystems are searched for it as raw bytes,
+        # without being decoded and cached
+        if not self.file_cache.file_contains(ts_file, "/services"):
+            return None
+        specifiers = self._file_specifiers(ts_file)
+        if not specifiers:
+            return None
+        file_path = self.path_helper.relative_to_target(ts_file)
+        return ts_file, file_path, specifiers, _path_domains(file_path)
+    
+    def _file_specifiers(self, ts_file: Path) -> Set[str]:
+        """Import specifiers of a file (see _from_specifiers).
+        
+        Scans are shared by content: files with identical content (barrels,
+        generated code) and domain files seen by both import checks are
+        scanned once. The content strings come from the file cache, so their
+        hashes are computed once too.
+        """
+        content = self.file_cache.get_file_info(ts_file).content
+        specifiers = self._specifiers_by_content.get(content)
+        if specifiers is None:
+            specifiers = _from_specifiers(content)
+            self._specifiers_by_content[content] = specifiers
+        return specifiers
+    
     def _check_services_structure(self, domain_dir: Path) -> List[ArchError]:
         """Check services directory structure within a domain."""
         errors = []
         services_dir = domain_dir / "services"
         
-        if services_dir.exists():
+        if "services" in self.file_cache.get_directory_names(domain_dir):
+            services_names = self.file_cache.get_directory_names(services_dir)
+            
             # Services must have dependencies.json
-            if not (services_dir / "dependencies.json").exists():
+            if "dependencies.json" not in services_names:
                 errors.append(ArchError.create_error(
                     message=f"❌ {services_dir} needs dependencies.json",
                     error_type=ErrorType.DOMAIN_STRUCTURE,
@@ -89,7 +209,7 @@ class DomainRuleChecker:
                 ))
             
             # Services must be exposed in services/index.ts
-            if not (services_dir / "index.ts").exists():
+            if "index.ts" not in services_names:
                 errors.append(ArchError.create_error(
                     message=f"❌ {services_dir} missing index.ts to expose services",
                     error_type=ErrorType.DOMAIN_STRUCTURE,
@@ -100,20 +220,47 @@ class DomainRuleChecker:
         
         return errors
     
-    def _check_infrastructure_structure(self, domain_dir: Path) -> List[ArchError]:
+    def _find_infrastructure_dirs(self, domains_path: Path) -> Dict[str, List[Path]]:
+        """Directories named infrastructure inside each domain, in the order domain_dir.rglob finds them.
+
+        rglob lists a directory's infrastructure children when it reaches the
+        directory itself, so they are ordered by their parent's place in the
+        pre-order walk. Symlinked infrastructure directories are indexed as
+        files, and are searched too.
+        """
+        positions = {directory: position for position, directory in enumerate(self.file_cache.indexed_dirs)}
+        candidates = [
+            directory for directory in self.file_cache.indexed_dirs if directory.name == "infrastructure"
+        ] + self.file_cache.files_named("infrastructure", under=domains_path)
+        
+        domains_prefix = os.path.join(str(domains_path), "")
+        infrastructure_dirs: Dict[str, List[Path]] = {}
+        for infrastructure_dir in sorted(candidates, key=lambda path: positions[path.parent]):
+            path_str = str(infrastructure_dir)
+            if not path_str.startswith(domains_prefix):
+                continue
+            domain_name, separator, _ = path_str[len(domains_prefix):].partition(os.sep)
+            if separator:
+                infrastructure_dirs.setdefault(domain_name, []).append(infrastructure_dir)
+        return infrastructure_dirs
+    
+    def _check_infrastructure_structure(self, infrastructure_dirs: List[Path]) -> List[ArchError]:
         """Check infrastructure directory structure within a domain."""
         errors = []
         
-        infra_dirs = list(domain_dir.rglob("infrastructure/*"))
-        for infra_dir in infra_dirs:
-            if infra_dir.is_dir() and not (infra_dir / "dependencies.json").exists():
-                errors.append(ArchError.create_error(
-                    message=f"❌ Infrastructure {infra_dir} needs dependencies.json",
-                    error_type=ErrorType.DOMAIN_STRUCTURE,
-                    subsystem=str(infra_dir),
-                    recommendation=f"Create {infra_dir}/dependencies.json file",
-                    recommendation_type=RecommendationType.CREATE_DEPENDENCIES_JSON
-                ))
+        for infrastructure_dir in infrastructure_dirs:
+            for entry in scan_directory(infrastructure_dir):
+                if not entry.is_dir():
+                    continue
+                infra_dir = Path(entry.path)
+                if "dependencies.json" not in self.file_cache.get_directory_names(infra_dir):
+                    errors.append(ArchError.create_error(
+                        message=f"❌ Infrastructure {infra_dir} needs dependencies.json",
+                        error_type=ErrorType.DOMAIN_STRUCTURE,
+                        subsystem=str(infra_dir),
+                        recommendation=f"Create {infra_dir}/dependencies.json file",
+                        recommendation_type=RecommendationType.CREATE_DEPENDENCIES_JSON
+                    ))
         
         return errors
     
@@ -122,7 +269,8 @@ class DomainRuleChecker:
         errors = []
         utils_dir = domain_dir / "utils"
         
-        if utils_dir.exists() and not (utils_dir / "index.ts").exists():
+        if ("utils" in self.file_cache.get_directory_names(domain_dir)
+                and "index.ts" not in self.file_cache.get_directory_names(utils_dir)):
             errors.append(ArchError.create_error(
                 message=f"❌ {utils_dir} missing index.ts to expose utilities",
                 error_type=ErrorType.DOMAIN_STRUCTURE,
@@ -183,84 +331,75 @@ class DomainRuleChecker:
 
         return errors
 
-    def _check_refined_service_import_violations(self, service_file: Path) -> List[ArchError]:
+    def _check_refined_service_import_violations(
+        self, service_file: Path, importing_files: List[_ImportingFile]
+    ) -> List[ArchError]:
         """Check service imports against refined domain rules."""
         errors = []
         
         # Extract domain name and import path for this service file
         domain_name = service_file.parts[-3]  # e.g., 'iam' from 'lib/domains/iam/services/...'
-        service_import_path = f"~/{service_file.relative_to(Path('src'))}"
-        service_import_path = service_import_path.replace(".ts", "")
+        service_import_path = "~/" + service_file.relative_to(_IMPORT_ROOT).with_suffix("").as_posix()
+        service_name = service_file.stem
+        service_subsystem = str(service_file.parent)
+        
+        # Specifiers (see _from_specifiers) of imports of this service
+        import_specifiers = {
+            f"'{service_import_path}'",
+            f"\"{service_import_path}\"",
+            # Also check if importing from the services index that reexports this service
+            f"'~/lib/domains/{domain_name}/services'",
+            f"\"~/lib/domains/{domain_name}/services\"",
+        }
         
-        typescript_files = find_typescript_files(self.path_helper.target_path)
+        domain_index_path = f"lib/domains/{domain_name}/index.ts"
         
         # Find files that import this service
-        for ts_file in typescript_files:
+        for ts_file, file_path, specifiers, path_domains in importing_files:
             # Skip the service file itself
             if ts_file == service_file:
                 continue
             
-            # Skip API/server files (always allowed)
-            file_str = str(ts_file)
-            if "/api/" in file_str or "/server/" in file_str:
+            # Check if this file imports this service
+            if import_specifiers.isdisjoint(specifiers):
                 continue
             
-            content = self.file_cache.get_file_info(ts_file).content
-            if not content:
+            # Apply refined rules based on importing file location
+            # Rule 1: {domain}/index.ts can import same domain services - ALLOWED
+            if file_path == domain_index_path:
                 continue
             
-            # Check if this file imports this service
-            import_patterns = [
-                f"from '{service_import_path}'",
-                f"from \"{service_import_path}\"",
-                # Also check if importing from the services index that reexports this service
-                f"from '~/lib/domains/{domain_name}/services'",
-                f"from \"~/lib/domains/{domain_name}/services\""
-            ]
-            
-            service_imported = any(pattern in content for pattern in import_patterns)
+            # Rule 2: {domain}/services/* can import same domain services - ALLOWED  
+            in_domain_services = path_domains.get(domain_name)
+            if in_domain_services:
+                continue
             
-            if service_imported:
-                # Apply refined rules based on importing file location
-                file_path = ts_file.relative_to(self.path_helper.target_path)
-                file_path_str = str(file_path)
-                
-                # Rule 1: {domain}/index.ts can import same domain services - ALLOWED
-                if file_path_str == f"lib/domains/{domain_name}/index.ts":
-                    continue
-                
-                # Rule 2: {domain}/services/* can import same domain services - ALLOWED  
-                if f"lib/domains/{domain_name}/services" in file_path_str:
-                    continue
-                
-                # Rule 3 & 4: Everything else in the domain CANNOT import services - ERROR
-                if f"lib/domains/{domain_name}/" in file_path_str:
-                    service_name = service_file.stem
-                    recommendation = f"Remove service import from {file_path} - only domain index.ts and services/* can import domain services"
-                    errors.append(ArchError.create_error(
-                        message=(f"❌ Service {service_name} imported by restricted file:\n"
-                               f"  🔸 {file_path}\n"
-                               f"     → Only domain index.ts and services/* can import domain services"),
-                        error_type=ErrorType.DOMAIN_IMPORT,
-                        subsystem=str(service_file.parent),
-                        file_path=str(file_path),
-                        recommendation=recommendation,
-                        recommendation_type=RecommendationType.FIX_DOMAIN_SERVICE_IMPORT
-                    ))
-                else:
-                    # Outside domain structure - should go through API
-                    service_name = service_file.stem
-                    recommendation = f"Move service import from {file_path} to API/server code, or use domain public interface"
-                    errors.append(ArchError.create_error(
-                        message=(f"❌ Service {service_name} imported by non-domain file:\n"
-                               f"  🔸 {file_path}\n"
-                               f"     → Services should only be used through API/server layer"),
-                        error_type=ErrorType.DOMAIN_IMPORT,
-                        subsystem=str(service_file.parent),
-                        file_path=str(file_path),
-                        recommendation=recommendation,
-                        recommendation_type=RecommendationType.MOVE_SERVICE_TO_API
-                    ))
+            # Rule 3 & 4: Everything else in the domain CANNOT import services - ERROR
+            if in_domain_services is not None:
+                recommendation = f"Remove service import from {file_path} - only domain index.ts and services/* can import domain services"
+                errors.append(ArchError.create_error(
+                    message=(f"❌ Service {service_name} imported by restricted file:\n"
+                           f"  🔸 {file_path}\n"
+                           f"     → Only domain index.ts and services/* can import domain services"),
+                    error_type=ErrorType.DOMAIN_IMPORT,
+                    subsystem=service_subsystem,
+                    file_path=file_path,
+                    recommendation=recommendation,
+                    recommendation_type=RecommendationType.FIX_DOMAIN_SERVICE_IMPORT
+                ))
+            else:
+                # Outside domain structure - should go through API
+                recommendation = f"Move service import from {file_path} to API/server code, or use domain public interface"
+                errors.append(ArchError.create_error(
+                    message=(f"❌ Service {service_name} imported by non-domain file:\n"
+                           f"  🔸 {file_path}\n"
+                           f"     → Services should only be used through API/server layer"),
+                    error_type=ErrorType.DOMAIN_IMPORT,
+                    subsystem=service_subsystem,
+                    file_path=file_path,
+                    recommendation=recommendation,
+                    recommendation_type=RecommendationType.MOVE_SERVICE_TO_API
+                ))
         
         return errors
     
@@ -275,13 +414,25 @@ class DomainRuleChecker:
         # Get all domain directories
         domain_dirs = [d for d in domains_path.iterdir() if d.is_dir()]
         
+        # The .ts files (test files included) of each domain, from the file index
+        domains_prefix = os.path.join(str(domains_path), "")
+        files_by_domain: Dict[str, List[Path]] = {}
+        for ts_file in self.file_cache.files_with_suffix(".ts", domains_path):
+            domain_name, separator, _ = str(ts_file)[len(domains_prefix):].partition(os.sep)
+            if separator:
+                files_by_domain.setdefault(domain_name, []).append(ts_file)
+        
         for domain_dir in domain_dirs:
             domain_name = domain_dir.name
             
             # Find all TypeScript files in this domain
-            for ts_file in domain_dir.rglob("*.ts"):
-                content = self.file_cache.get_file_info(ts_file).content
-                if not content:
+            for ts_file in files_by_domain.get(domain_name, []):
+                # Most files import nothing from a domain; a single substring
+                # test spares them the scan and the loop over other domains
+                if not self.file_cache.file_contains(ts_file, _DOMAIN_IMPORT_PREFIX):
+                    continue
+                imported_domains = _forbidden_domain_imports(self._file_specifiers(ts_file))
+                if not imported_domains:
                     continue
                 
                 # Check for imports from other domains
@@ -291,33 +442,20 @@ class DomainRuleChecker:
                     
                     other_domain_name = other_domain_dir.name
                     
-                    # Look for imports from other domains (but allow utils)
-                    forbidden_patterns = [
-                        f"from '~/lib/domains/{other_domain_name}/services",
-                        f"from \"~/lib/domains/{other_domain_name}/services",
-                        f"from '~/lib/domains/{other_domain_name}/infrastructure",
-                        f"from \"~/lib/domains/{other_domain_name}/infrastructure",
-                        f"from '~/lib/domains/{other_domain_name}/_",
-                        f"from \"~/lib/domains/{other_domain_name}/_",
-                        f"from '~/lib/domains/{other_domain_name}/index",
-                        f"from \"~/lib/domains/{other_domain_name}/index",
-                    ]
-                    
-                    for pattern in forbidden_patterns:
-                        if pattern in content:
-                            file_path = ts_file.relative_to(self.path_helper.target_path)
-                            recommendation = f"Remove cross-domain import from {file_path} - domains should only import other domain utils, not services/infrastructure"
-                            errors.append(ArchError.create_error(
-                                message=(f"❌ Cross-domain import violation:\n"
-                                       f"  🔸 {file_path}\n"
-                                       f"     → Domain '{domain_name}' importing from domain '{other_domain_name}'\n"
-                                       f"     → Use API orchestration instead of direct domain-to-domain calls"),
-                                error_type=ErrorType.DOMAIN_IMPORT,
-                                subsystem=str(ts_file.parent),
-                                file_path=str(file_path),
-                                recommendation=recommendation,
-                                recommendation_type=RecommendationType.REMOVE_CROSS_DOMAIN_IMPORT
-                            ))
-                            break  # Only report first violation per file
+                    # At most one violation per file and other domain
+                    if other_domain_name in imported_domains:
+                        file_path = self.path_helper.relative_to_target(ts_file)
+                        recommendation = f"Remove cross-domain import from {file_path} - domains should only import other domain utils, not services/infrastructure"
+                        errors.append(ArchError.create_error(
+                            message=(f"❌ Cross-domain import violation:\n"
+                                   f"  🔸 {file_path}\n"
+                                   f"     → Domain '{domain_name}' importing from domain '{other_domain_name}'\n"
+                                   f"     → Use API orchestration instead of direct domain-to-domain calls"),
+                            error_type=ErrorType.DOMAIN_IMPORT,
+                            subsystem=str(ts_file.parent),
+                            file_path=file_path,
+                            recommendation=recommendation,
+                            recommendation_type=RecommendationType.REMOVE_CROSS_DOMAIN_IMPORT
+                        ))
         
         return errors
\ No newline at end of file
@@ -6,34 +6,147 @@ Handles checking import boundaries and reexport restrictions.
 """
 
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, FrozenSet, Iterable, List, Match, Optional, Set, Tuple
 
 from ..models import ArchError, ErrorType, RecommendationType, SubsystemInfo
-from ..utils.file_utils import find_typescript_files
+from ..utils.file_utils import MIN_FILES_FOR_PROCESS_POOL, get_process_pool
 from ..utils.import_utils import (
+    build_allowed_index,
     is_child_of_subsystem, 
-    resolve_inheritance_chain,
-    is_import_allowed_by_set
+    is_import_allowed_by_index,
+    path_boundary_prefixes
 )
 from ..utils.path_utils import PathHelper
 
 
+# Imports starting with ~/ resolve below this directory
+_SRC = Path("src")
+
+# Import path of a `from '...'` clause
+_FROM_IMPORT_RE = re.compile(r"from\s+['\"]([^'\"]*)['\"]")
+
+# Reexport statements: export { ... } from, export type { ... } from and
+# export * from, in one pattern so a file is scanned once; the reexported
+# path is the path group, the type and star groups tell the forms apart
+_REEXPORT_RE = re.compile(
+    r'export\s+(?:\{[^}]*\}|(?P<type>type)\s+\{[^}]*\}|(?P<star>\*))\s+from\s+["\'](?P<path>[^"\']+)["\']'
+)
+
+# Import of a specific file in a domain's utils, with the domain as group 1
+_SPECIFIC_UTILS_IMPORT_RE = re.compile(r"~/lib/domains/([^/]+)/utils/[^/]+$")
+
+def _find_reexports(content: str) -> List[Match[str]]:
+    """Reexport statements in content, ordered by form: export { ... }, then export type { ... }, then export *."""
+    return sorted(
+        _REEXPORT_RE.finditer(content),
+        key=lambda match: 2 if match.group("star") else 1 if match.group("type") else 0
+    )
+
+
+def _path_alternation(paths: Iterable[str]) -> str:
+    """Regex alternation matching exactly the given paths, factored by '/'-separated segments.
+
+    Paths sharing leading segments share a branch, so the regex engine
+    follows a path's segments instead of trying every path in turn.
+    """
+    trie: Dict[Optional[str], dict] = {}
+    for path in paths:
+        node = trie
+        for segment in path.split('/'):
+            node = node.setdefault(segment, {})
+        node[None] = {}  # A path ends here
+
+    def alternation(node: dict) -> str:
+        branches = []
+        for segment, child in node.items():
+            if segment is None:
+                continue
+            rest = {key: value for key, value in child.items() if key is not None}
+            if not rest:
+                branches.append(re.escape(segment))
+            elif None in child:
+                branches.append(f"{re.escape(segment)}(?:/{alternation(rest)})?")
+            else:
+                branches.append(f"{re.escape(segment)}/{alternation(rest)}")
+        return f"(?:{'|'.join(branches)})"
+
+    return alternation(trie)
+
+
+def _line_starts(content: str) -> List[int]:
+    """Offset at which each line of content after the first starts, for _line_number."""
+    return list(accumulate(len(line) + 1 for line in content.split('\n')))[:-1]
+
+
+def _line_number(line_starts: List[int], offset: int) -> int:
+    """1-based number of the line containing offset, found by bisection instead of counting newlines."""
+    return bisect_right(line_starts, offset) + 1
+
+
+def _check_outbound_imports(subsystem_name: str, subsystem_path: Path,
+                            file_imports: List[Tuple[Path, List[str]]],
+                            allowed_index: Dict[str, Tuple[str, ...]]) -> List[ArchError]:
+    """Check the imports of one subsystem's files against its allowed dependencies.
+
+    Module level so it can run in a worker process.
+    """
+    subsystem_errors = []
+    
+    # Check each file's imports
+    for file_path, imports in file_imports:
+        for import_path in imports:
+            # Skip internal imports
+            if not import_path.startswith("~/") and not import_path.startswith("../"):
+                continue
+            
+            # Convert relative to absolute (simplified for now)
+            if import_path.startswith("../"):
+                continue
+            
+            # Check if import is allowed (exact match or hierarchical)
+            is_allowed = is_import_allowed_by_index(import_path, allowed_index, subsystem_path)
+            
+            if not is_allowed:
+                recommendation = f"Add '{import_path}' to {subsystem_path}/dependencies.json 'allowed' array"
+                subsystem_errors.append(ArchError.create_error(
+                    message=(f"❌ Undeclared outbound dependency in {subsystem_name}:\n"
+                           f"  🔸 {file_path.relative_to(subsystem_path)}\n"
+                           f"     import from '{import_path}'\n"
+                           f"     → {recommendation}"),
+                    error_type=ErrorType.IMPORT_BOUNDARY,
+                    subsystem=str(subsystem_path),
+                    file_path=str(file_path),
+                    recommendation=recommendation,
+                    recommendation_type=RecommendationType.ADD_ALLOWED_DEPENDENCY
+                ))
+    
+    return subsystem_errors
+
+
 class ImportRuleChecker:
     """Checker for import boundaries and reexport rules."""
     
     def __init__(self, path_helper: PathHelper, file_cache):
         self.path_helper = path_helper
         self.file_cache = file_cache
+        # Dependencies inherited from each directory and its ancestors, per
+        # outbound dependency check run; sibling subsystems share ancestors
+        self._inheritance_cache: Dict[Path, FrozenSet[str]] = {}
+        # Absolute import path of each subsystem, asked for by most checks
+        self._import_paths: Dict[Path, str] = {}
     
     def check_import_boundaries(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
         """Check that external imports go through subsystem index files."""
         errors = []
         # print("Checking import boundaries...")
 
+        violations_by_subsystem = self._find_import_boundary_violations(subsystems)
+
         for subsystem in subsystems:
-            violations = self._find_import_boundary_violations(subsystem)
+            violations = violations_by_subsystem.get(subsystem.path)
 
             if violations:
                 # Provide context based on subsystem type
@@ -45,13 +158,13 @@ class ImportRuleChecker:
                     recommendation=f"Create or update {subsystem.path}/index.ts to reexport internal modules",
                     recommendation_type=RecommendationType.CREATE_SUBSYSTEM_INDEX
                 ))
+                subsystem_abs_path = self._import_path(subsystem)
                 for v in violations:
                     # Extract the import path from the violation
-                    import_match = re.search(r"from\s+['\"]([^'\"]*)['\"]", v['import'])
+                    import_match = _FROM_IMPORT_RE.search(v['import'])
                     if import_match:
                         import_path = import_match.group(1)
                         # Suggest changing the import to use the index
-                        subsystem_abs_path = f"~/{subsystem.path.relative_to(Path('src'))}"
                         recommendation = f"Change import from '{import_path}' to '{subsystem_abs_path}' (via index.ts)"
                     else:
                         recommendation = f"Import through {subsystem.path}/index.ts instead of direct file access"
@@ -107,107 +220,125 @@ class ImportRuleChecker:
         return errors
     
     def check_outbound_dependencies_parallel(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
-        """Check outbound dependencies against allowlist with parallel processing."""
+        """Check outbound dependencies against allowlist, in worker processes on large projects.
+
+        The workers are forked on first use, so this must run before any
+        other thread is started (ArchitectureChecker runs it ahead of the
+        check phases).
+        """
         errors = []
-        # print("Checking outbound dependencies...")
         
-        def check_single_subsystem(subsystem: SubsystemInfo) -> List[ArchError]:
-            subsystem_errors = []
-            
-            # Get all allowed dependencies (local + inherited)
-            allowed_deps = set(subsystem.dependencies.get("allowed", []))
-            allowed_children = set(subsystem.dependencies.get("allowedChildren", []))
-            inherited = set(resolve_inheritance_chain(subsystem, self.file_cache))
-            
-            all_allowed = allowed_deps | allowed_children | inherited
-            
-            # Add domain _objects if in domain
-            if self.path_helper.is_domain_path(subsystem.path):
-                all_allowed.add("_objects")
-            
-            # Domain utils are implicitly allowed - handled in is_import_allowed_by_set
-            
-            # Check each file's imports
-            for file_info in subsystem.files:
-                for import_path in file_info.imports:
-                    # Skip internal imports
-                    if not import_path.startswith("~/") and not import_path.startswith("../"):
-                        continue
-                    
-                    # Convert relative to absolute (simplified for now)
-                    if import_path.startswith("../"):
-                        continue
-                    
-                    # Check if import is allowed (exact match or hierarchical)
-                    is_allowed = is_import_allowed_by_set(import_path, all_allowed, subsystem.path)
-                    
-                    if not is_allowed:
-                        recommendation = f"Add '{import_path}' to {subsystem.path}/dependencies.json 'allowed' array"
-                        subsystem_errors.append(ArchError.create_error(
-                            message=(f"❌ Undeclared outbound dependency in {subsystem.name}:\n"
-                                   f"  🔸 {file_info.path.relative_to(subsystem.path)}\n"
-                                   f"     import from '{import_path}'\n"
-                                   f"     → {recommendation}"),
-                            error_type=ErrorType.IMPORT_BOUNDARY,
-                            subsystem=str(subsystem.path),
-                            file_path=str(file_info.path),
-                            recommendation=recommendation,
-                            recommendation_type=RecommendationType.ADD_ALLOWED_DEPENDENCY
-                        ))
-            
-            return subsystem_errors
+        # Allowed dependencies are resolved once per subsystem up front
+        self._inheritance_cache.clear()
+        allowed_by_subsystem = [(subsystem, self._build_allowed(subsystem)) for subsystem in subsystems]
         
-        # Process subsystems in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_to_subsystem = {
-                executor.submit(check_single_subsystem, subsystem): subsystem
-                for subsystem in subsystems
-            }
-            
-            for future in as_completed(future_to_subsystem):
-                subsystem_errors = future.result()
-                errors.extend(subsystem_errors)
+        # Workers get the imports of each file rather than the whole
+        # subsystem, so file contents are not sent to other processes
+        names = [subsystem.name for subsystem, _ in allowed_by_subsystem]
+        paths = [subsystem.path for subsystem, _ in allowed_by_subsystem]
+        file_imports = [
+            [(file_info.path, file_info.imports) for file_info in subsystem.files]
+            for subsystem, _ in allowed_by_subsystem
+        ]
+        # Indexed by path, so each import is only checked against the allowed
+        # dependencies it can match
+        allowed = [build_allowed_index(all_allowed) for _, all_allowed in allowed_by_subsystem]
+        
+        # Checking imports is pure Python and holds the GIL, so large projects
+        # are processed in worker processes rather than threads
+        file_count = sum(len(imports) for imports in file_imports)
+        pool = get_process_pool() if file_count >= MIN_FILES_FOR_PROCESS_POOL else None
+        if pool is None:
+            results = map(_check_outbound_imports, names, paths, file_imports, allowed)
+        else:
+            executor, workers = pool
+            results = executor.map(
+                _check_outbound_imports, names, paths, file_imports, allowed,
+                chunksize=max(1, len(subsystems) // (4 * workers)),
+            )
+        
+        for subsystem_errors in results:
+            errors.extend(subsystem_errors)
         
         return errors
     
+    def _build_allowed(self, subsystem: SubsystemInfo) -> FrozenSet[str]:
+        """All dependencies a subsystem may import (local + inherited)."""
+        allowed_deps = subsystem.dependencies.get("allowed", [])
+        allowed_children = subsystem.dependencies.get("allowedChildren", [])
+        # Ancestor subsystems and their allowedChildren, as resolve_inheritance_chain finds them
+        inherited = self._inherited_from(subsystem.path.parent)
+        
+        all_allowed = inherited.union(allowed_deps, allowed_children)
+        
+        # Add domain _objects if in domain
+        if self.path_helper.is_domain_path(subsystem.path):
+            all_allowed |= {"_objects"}
+        
+        # Domain utils are implicitly allowed - handled in is_import_allowed_by_index
+        return all_allowed
+    
+    def _inherited_from(self, directory: Path) -> FrozenSet[str]:
+        """Dependencies inherited from a directory and its ancestors up to src/ (cached per directory)."""
+        inherited = self._inheritance_cache.get(directory)
+        if inherited is not None:
+            return inherited
+        
+        if directory in (_SRC, Path("."), Path("/")):
+            inherited = frozenset()
+        else:
+            parent = directory.parent
+            inherited = frozenset() if parent == directory else self._inherited_from(parent)
+            
+            deps_file = directory / "dependencies.json"
+            if deps_file.exists():
+                # The ancestor subsystem itself and its allowedChildren
+                deps = self.file_cache.load_dependencies_json(deps_file)
+                inherited = inherited.union(
+                    [f"~/{directory.relative_to(_SRC)}"], deps.get("allowedChildren", [])
+                )
+        
+        self._inheritance_cache[directory] = inherited
+        return inherited
+    
     def check_router_import_patterns(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
         """Check for imports from router subsystems - warn to use specific child instead."""
         errors = []
         # print("Checking router import patterns...")
 
-        # Build a map of router subsystems by their import path
-        router_subsystems = {}
+        # Build a map of router subsystems by their import path, with the list
+        # of child subsystems suggested instead
+        router_children = {}
         for subsystem in subsystems:
             if subsystem.subsystem_type == "router":
-                subsystem_abs_path = f"~/{subsystem.path.relative_to(Path('src'))}"
-                router_subsystems[subsystem_abs_path] = subsystem
+                subsystem_abs_path = self._import_path(subsystem)
+                child_subsystems = subsystem.dependencies.get("subsystems", [])
+                router_children[subsystem_abs_path] = ", ".join([child.lstrip("./") for child in child_subsystems])
 
         # Check all subsystems for imports from routers
         for subsystem in subsystems:
             for file_info in subsystem.files:
                 for import_path in file_info.imports:
-                    # Check if importing from a router subsystem's index
-                    for router_path, router_subsystem in router_subsystems.items():
-                        # Match exact router path (importing from index) but not child paths
-                        if import_path == router_path:
-                            # Get list of child subsystems for suggestion
-                            child_subsystems = router_subsystem.dependencies.get("subsystems", [])
-                            children_list = ", ".join([child.lstrip("./") for child in child_subsystems])
-
-                            recommendation = f"Consider importing from specific child subsystem instead: {router_path}/[{children_list}]"
-
-                            errors.append(ArchError.create_warning(
-                                message=(f"⚠️  Import from router subsystem in {subsystem.name}:\n"
-                                       f"  🔸 {file_info.path.relative_to(subsystem.path)}\n"
-                                       f"     import from '{import_path}'\n"
-                                       f"     → Router subsystems are aggregators - prefer importing from specific children for explicit dependency tracking\n"
-                                       f"     → Available children: {children_list}"),
-                                error_type=ErrorType.IMPORT_BOUNDARY,
-                                subsystem=str(subsystem.path),
-                                file_path=str(file_info.path),
-                                recommendation=recommendation,
-                                recommendation_type=RecommendationType.USE_SPECIFIC_CHILD
-                            ))
+                    # Check if importing from a router subsystem's index: match exact
+                    # router path (importing from index) but not child paths
+                    children_list = router_children.get(import_path)
+                    if children_list is None:
+                        continue
+
+                    recommendation = f"Consider importing from specific child subsystem instead: {import_path}/[{children_list}]"
+
+                    errors.append(ArchError.create_warning(
+                        message=(f"⚠️  Import from router subsystem in {subsystem.name}:\n"
+                               f"  🔸 {file_info.path.relative_to(subsystem.path)}\n"
+                               f"     import from '{import_path}'\n"
+                               f"     → Router subsystems are aggregators - prefer importing from specific children for explicit dependency tracking\n"
+                               f"     → Available children: {children_list}"),
+                        error_type=ErrorType.IMPORT_BOUNDARY,
+                        subsystem=str(subsystem.path),
+                        file_path=str(file_info.path),
+                        recommendation=recommendation,
+                        recommendation_type=RecommendationType.USE_SPECIFIC_CHILD
+                    ))
 
         return errors
 
@@ -218,49 +349,51 @@ class ImportRuleChecker:
 
         for subsystem in subsystems:
             for file_info in subsystem.files:
+                # A utils/index.ts file may import from its own utils files
+                # This allows utils/index.ts to aggregate exports from its own files
+                own_domain = self._utils_index_domain(file_info.path)
+
                 for import_path in file_info.imports:
                     # Check if it's a domain utils import to a specific file (not index)
-                    import re
-                    specific_utils_pattern = r"~/lib/domains/[^/]+/utils/[^/]+$"
-                    if re.match(specific_utils_pattern, import_path) and not import_path.endswith("/index"):
-                        # Skip if this is a utils/index.ts file importing from its own utils files
-                        # This allows utils/index.ts to aggregate exports from its own files
-                        if file_info.path.name == "index.ts" and file_info.path.parent.name == "utils":
-                            # Check if the import is from the same domain
-                            domain_match = re.match(r"~/lib/domains/([^/]+)/utils/.*", import_path)
-                            if domain_match:
-                                import_domain = domain_match.group(1)
-                                # Get the domain of the current file
-                                file_path_parts = file_info.path.parts
-                                if "domains" in file_path_parts:
-                                    domains_index = file_path_parts.index("domains")
-                                    if domains_index + 1 < len(file_path_parts):
-                                        current_domain = file_path_parts[domains_index + 1]
-                                        # If importing from same domain, allow it
-                                        if import_domain == current_domain:
-                                            continue
-
-                        # Extract domain and suggest proper import
-                        domain_match = re.match(r"~/lib/domains/([^/]+)/utils/.*", import_path)
-                        if domain_match:
-                            domain_name = domain_match.group(1)
-                            proper_import = f"~/lib/domains/{domain_name}/utils"
-
-                            error = ArchError.create_error(
-                                message=(f"❌ Direct utils file import in {subsystem.name}:\n"
-                                       f"  🔸 {file_info.path.relative_to(subsystem.path)}\n"
-                                       f"     import from '{import_path}'\n"
-                                       f"     → Use '{proper_import}' instead (import through utils index.ts)"),
-                                error_type=ErrorType.IMPORT_BOUNDARY,
-                                subsystem=str(subsystem.path),
-                                file_path=str(file_info.path),
-                                recommendation=f"Change import from '{import_path}' to '{proper_import}' (use utils index.ts)",
-                                recommendation_type=RecommendationType.USE_UTILS_INTERFACE
-                            )
-                            errors.append(error)
+                    utils_match = _SPECIFIC_UTILS_IMPORT_RE.match(import_path)
+                    if not utils_match or import_path.endswith("/index"):
+                        continue
+
+                    # Skip if this is a utils/index.ts file importing from its own utils files
+                    domain_name = utils_match.group(1)
+                    if domain_name == own_domain:
+                        continue
+
+                    # Suggest proper import
+                    proper_import = f"~/lib/domains/{domain_name}/utils"
+
+                    error = ArchError.create_error(
+                        message=(f"❌ Direct utils file import in {subsystem.name}:\n"
+                               f"  🔸 {file_info.path.relative_to(subsystem.path)}\n"
+                               f"     import from '{import_path}'\n"
+                               f"     → Use '{proper_import}' instead (import through utils index.ts)"),
+                        error_type=ErrorType.IMPORT_BOUNDARY,
+                        subsystem=str(subsystem.path),
+                        file_path=str(file_info.path),
+                        recommendation=f"Change import from '{import_path}' to '{proper_import}' (use utils index.ts)",
+                        recommendation_type=RecommendationType.USE_UTILS_INTERFACE
+                    )
+                    errors.append(error)
         
         return errors
     
+    @staticmethod
+    def _utils_index_domain(file_path: Path) -> Optional[str]:
+        """Domain of a utils/index.ts file (the directory after "domains" in its path), or None."""
+        if file_path.name != "index.ts" or file_path.parent.name != "utils":
+            return None
+        file_path_parts = file_path.parts
+        if "domains" in file_path_parts:
+            domains_index = file_path_parts.index("domains")
+            if domains_index + 1 < len(file_path_parts):
+                return file_path_parts[domains_index + 1]
+        return None
+    
     def check_standalone_index_reexports(self, index_files: List[Path]) -> List[ArchError]:
         """Check upward reexports in all index.ts files, not just those in formal subsystems."""
         errors = []
@@ -277,11 +410,12 @@ class ImportRuleChecker:
             violations = self._find_standalone_index_violations(pseudo_subsystem)
             
             if violations:
+                relative_index_file = index_file.relative_to(_SRC)
                 errors.append(ArchError.create_error(
-                    message=f"❌ Invalid upward reexports in {index_file.relative_to(Path('src'))}:",
+                    message=f"❌ Invalid upward reexports in {relative_index_file}:",
                     error_type=ErrorType.REEXPORT_BOUNDARY,
                     subsystem=str(index_file.parent),
-                    recommendation=f"Fix upward reexports in {index_file.relative_to(Path('src'))} - index files should not reexport from parent directories",
+                    recommendation=f"Fix upward reexports in {relative_index_file} - index files should not reexport from parent directories",
                     recommendation_type=RecommendationType.FIX_REEXPORT_BOUNDARY
                 ))
                 
@@ -299,63 +433,84 @@ class ImportRuleChecker:
         
         return errors
     
-    def _find_import_boundary_violations(self, subsystem: SubsystemInfo) -> List[dict]:
-        """Find violations where external files import directly into subsystem."""
-        violations = []
+    def _find_import_boundary_violations(self, subsystems: List[SubsystemInfo]) -> Dict[Path, List[dict]]:
+        """Find violations where external files import directly into subsystems, by subsystem path."""
+        violations: Dict[Path, List[dict]] = {}
 
         # Router and API subsystems allow direct child imports (no index.ts interface)
-        if subsystem.subsystem_type in ("router", "api"):
+        # Others are looked up by their full import path for precise matching
+        subsystems_by_import_path = {
+            self._import_path(subsystem): subsystem
+            for subsystem in subsystems
+            if subsystem.subsystem_type not in ("router", "api")
+        }
+        if not subsystems_by_import_path:
             return violations
 
-        # We want to find EXTERNAL files that import directly into this subsystem
-        typescript_files = find_typescript_files(self.path_helper.target_path)
+        # We want to find EXTERNAL files that import directly into a subsystem;
+        # each file is read and scanned once for all subsystems, with a regex
+        # that only matches imports going below a subsystem path
+        import_pattern = re.compile(
+            rf'from\s+["\']({_path_alternation(subsystems_by_import_path)}/[^"\']*)["\']'
+        )
+        typescript_files = self.file_cache.typescript_files(self.path_helper.target_path)
 
         for ts_file in typescript_files:
             # Skip index.ts files - they're allowed to import from their children
             if ts_file.name == "index.ts":
                 continue
 
-            file_str = str(ts_file)
-
-            # Skip if file IS within this subsystem (internal files, not external importers)
-            if str(subsystem.path) in file_str:
+            # Subsystem import paths all start with ~/, so a file without it
+            # imports into none; checking the raw content first spares
+            # decoding and scanning it
+            if not self.file_cache.file_contains(ts_file, "~/"):
                 continue
 
-            # Skip if file is in a child subsystem (children can import parent freely)
-            if is_child_of_subsystem(ts_file, subsystem, {}):  # TODO: pass proper subsystem_cache
-                continue
-
-            # Now check if this external file imports into the subsystem
             content = self.file_cache.get_file_info(ts_file).content
             if not content:
                 continue
 
-            # Find imports that bypass index.ts
-            # Use full subsystem path for precise matching
-            subsystem_abs_path = f"~/{subsystem.path.relative_to(Path('src'))}"
-            import_pattern = rf'from\s+["\']({re.escape(subsystem_abs_path)}/[^"\']*)["\']'
-            matches = re.finditer(import_pattern, content, re.MULTILINE)
+            file_str = str(ts_file)
+            # Built on the first violation in the file
+            line_starts = None
 
-            for match in matches:
+            for match in import_pattern.finditer(content):
                 import_path = match.group(1)
-                # Skip if importing from index or root
-                sub_path = import_path[len(subsystem_abs_path) + 1:]
-                if not sub_path or sub_path == "index":
-                    continue
 
-                # Check if importing file has permission through its own inheritance chain
-                if self._file_has_import_permission(ts_file, import_path):
-                    continue
+                # An import goes into every subsystem whose path it extends
+                for subsystem_abs_path in path_boundary_prefixes(import_path):
+                    subsystem = subsystems_by_import_path.get(subsystem_abs_path)
+                    if subsystem is None:
+                        continue
 
-                line_num = content[:match.start()].count('\n') + 1
-                violations.append({
-                    'file': ts_file,
-                    'line': line_num,
-                    'import': match.group(0)
-                })
+                    # Skip if file IS within this subsystem (internal files, not external importers)
+                    if str(subsystem.path) in file_str:
+                        continue
+
+                    # Skip if file is in a child subsystem (children can import parent freely)
+                    if is_child_of_subsystem(ts_file, subsystem, {}):  # TODO: pass proper subsystem_cache
+                        continue
+
+                    # Skip if importing from index or root
+                    sub_path = import_path[len(subsystem_abs_path) + 1:]
+                    if not sub_path or sub_path == "index":
+                        continue
+
+                    # Check if importing file has permission through its own inheritance chain
+                    if self._file_has_import_permission(ts_file, import_path):
+                        continue
+
+                    if line_starts is None:
+                        line_starts = _line_starts(content)
+                    line_num = _line_number(line_starts, match.start())
+                    violations.setdefault(subsystem.path, []).append({
+                        'file': ts_file,
+                        'line': line_num,
+                        'import': match.group(0)
+                    })
 
         return violations
-    
+
     def _find_reexport_violations(self, subsystem: SubsystemInfo) -> List[dict]:
         """Find reexport violations in subsystem index.ts."""
         index_file = subsystem.path / "index.ts"
@@ -367,29 +522,24 @@ class ImportRuleChecker:
             return []
         
         # Find all reexport statements (export { ... } from '...' and export * from '...')
-        reexport_pattern = r'export\s+\{[^}]*\}\s+from\s+["\']([^"\']+)["\']'
-        reexport_type_pattern = r'export\s+type\s+\{[^}]*\}\s+from\s+["\']([^"\']+)["\']'
-        reexport_star_pattern = r'export\s+\*\s+from\s+["\']([^"\']+)["\']'
-        
         violations = []
         
-        for pattern in [reexport_pattern, reexport_type_pattern, reexport_star_pattern]:
-            matches = re.finditer(pattern, content, re.MULTILINE)
+        line_starts = _line_starts(content)
+        for match in _find_reexports(content):
+            import_path = match.group("path")
+            line_num = _line_number(line_starts, match.start())
             
-            for match in matches:
-                import_path = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
-                
-                violation = self._check_reexport_violation(
-                    subsystem, import_path, match.group(0), line_num)
-                if violation:
-                    violations.append(violation)
+            violation = self._check_reexport_violation(
+                subsystem, import_path, match.group(0), line_num)
+            if violation:
+                violations.append(violation)
         
         return violations
     
     def _check_reexport_violation(self, subsystem: SubsystemInfo, import_path: str,
                                  full_statement: str, line_num: int) -> dict:
         """Check if a single reexport violates rules."""
+        subsystem_abs_path = self._import_path(subsystem)
 
         # NEW RULE: index.ts files cannot reexport from parent/higher directories
         if self._is_upward_reexport(subsystem, import_path):
@@ -412,7 +562,6 @@ class ImportRuleChecker:
                     'reason': 'domain index should not reexport utils - import directly from utils instead'
                 }
             # Check for absolute utils imports within same domain
-            subsystem_abs_path = f"~/{subsystem.path.relative_to(Path('src'))}"
             utils_path = f"{subsystem_abs_path}/utils"
             if import_path == utils_path or import_path.startswith(f"{utils_path}/"):
                 return {
@@ -426,8 +575,7 @@ class ImportRuleChecker:
         # This allows utils to create a client-safe API without server dependencies
         if self._is_domain_utils(subsystem):
             # Check if import is from the same domain
-            subsystem_rel_path = subsystem.path.relative_to(Path('src'))
-            path_parts = subsystem_rel_path.parts
+            path_parts = subsystem.path.parts[1:]  # below src
             if len(path_parts) >= 4 and path_parts[0] == 'lib' and path_parts[1] == 'domains':
                 domain_name = path_parts[2]
                 domain_prefix = f"~/lib/domains/{domain_name}"
@@ -464,8 +612,6 @@ class ImportRuleChecker:
         
         elif import_path.startswith('~/'):
             # Check if this is an internal absolute path within the same subsystem
-            subsystem_abs_path = f"~/{subsystem.path.relative_to(Path('src'))}"
-            
             if import_path.startswith(f"{subsystem_abs_path}/"):
                 # This is an internal absolute path reexport - allowed
                 return None
@@ -534,8 +680,8 @@ class ImportRuleChecker:
         """Check if this reexport goes to a higher-level directory (parent or ancestor sibling)."""
         # EXCEPTION: Domain utils can reexport from their parent domain
         # Pattern: src/lib/domains/DOMAIN/utils can reexport from ~/lib/domains/DOMAIN/*
-        subsystem_rel_path = subsystem.path.relative_to(Path('src'))
-        path_parts = subsystem_rel_path.parts
+        subsystem_abs_path = self._import_path(subsystem)
+        path_parts = subsystem.path.parts[1:]  # below src
 
         # Check if this is a domain utils directory
         if (len(path_parts) >= 4 and
@@ -548,7 +694,6 @@ class ImportRuleChecker:
 
             # If importing from the same domain (but not a child), allow it
             if import_path.startswith(domain_prefix):
-                subsystem_abs_path = f"~/{subsystem_rel_path}"
                 # Make sure it's not a child import (those are already allowed)
                 if not import_path.startswith(f"{subsystem_abs_path}/"):
                     # This is a same-domain import for utils - allowed
@@ -560,11 +705,6 @@ class ImportRuleChecker:
 
         # Handle absolute paths that point to higher-level directories
         if import_path.startswith('~/'):
-            # Get the subsystem's path relative to src
-            subsystem_rel_path = subsystem.path.relative_to(Path('src'))
-            # Convert to absolute import pattern
-            subsystem_abs_path = f"~/{subsystem_rel_path}"
-
             # If the import path is identical to subsystem path, it's not upward (self-import)
             if import_path == subsystem_abs_path:
                 return False
@@ -594,6 +734,14 @@ class ImportRuleChecker:
 
         return False
     
+    def _import_path(self, subsystem: SubsystemInfo) -> str:
+        """Absolute import path of a subsystem (~/ and its path below src), cached per path."""
+        import_path = self._import_paths.get(subsystem.path)
+        if import_path is None:
+            import_path = f"~/{subsystem.path.relative_to(_SRC)}"
+            self._import_paths[subsystem.path] = import_path
+        return import_path
+    
     def _is_domain_index(self, subsystem: SubsystemInfo) -> bool:
         """Check if this subsystem represents a domain's main index.ts file."""
         # Domain paths look like: src/lib/domains/DOMAIN_NAME
@@ -651,26 +799,20 @@ class ImportRuleChecker:
             return []
         
         # Find all reexport statements using same patterns as formal subsystems
-        reexport_pattern = r'export\s+\{[^}]*\}\s+from\s+["\']([^"\']+)["\']'
-        reexport_type_pattern = r'export\s+type\s+\{[^}]*\}\s+from\s+["\']([^"\']+)["\']'
-        reexport_star_pattern = r'export\s+\*\s+from\s+["\']([^"\']+)["\']'
-        
         violations = []
         
-        for pattern in [reexport_pattern, reexport_type_pattern, reexport_star_pattern]:
-            matches = re.finditer(pattern, content, re.MULTILINE)
+        line_starts = _line_starts(content)
+        for match in _find_reexports(content):
+            import_path = match.group("path")
+            line_num = _line_number(line_starts, match.start())
             
-            for match in matches:
-                import_path = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
-                
-                # Only check for upward reexports (our specific rule)
-                if self._is_upward_reexport(pseudo_subsystem, import_path):
-                    violations.append({
-                        'line': line_num,
-                        'import': import_path,
-                        'full_statement': match.group(0),
-                        'reason': 'index.ts files cannot reexport from parent directories - either move implementation here or import directly from original location'
-                    })
+            # Only check for upward reexports (our specific rule)
+            if self._is_upward_reexport(pseudo_subsystem, import_path):
+                violations.append({
+                    'line': line_num,
+                    'import': import_path,
+                    'full_statement': match.group(0),
+                    'reason': 'index.ts files cannot reexport from parent directories - either move implementation here or import directly from original location'
+                })
         
         return violations
\ No newline at end of file
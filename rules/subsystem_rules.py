@@ -7,10 +7,9 @@ Handles checking subsystem declarations, file/folder conflicts, and dependency f
 
 import re
 from pathlib import Path
-from typing import List, Set
+from typing import Any, Dict, List, Optional, Set
 
 from ..models import ArchError, ErrorType, RecommendationType, SubsystemInfo
-from ..utils.file_utils import find_typescript_files
 from ..utils.path_utils import PathHelper
 from ..utils.import_utils import find_redundant_ancestor_declarations
 
@@ -21,6 +20,29 @@ class SubsystemRuleChecker:
     def __init__(self, path_helper: PathHelper, file_cache):
         self.path_helper = path_helper
         self.file_cache = file_cache
+        self.subsystems_by_path: Dict[Path, SubsystemInfo] = {}
+        self.subsystem_children: Dict[Path, List[SubsystemInfo]] = {}
+    
+    def set_subsystem_index(self, subsystems_by_path: Dict[Path, SubsystemInfo],
+                            subsystem_children: Dict[Path, List[SubsystemInfo]]) -> None:
+        """Share the orchestrator's subsystem index to avoid per-parent filesystem lookups."""
+        self.subsystems_by_path = subsystems_by_path
+        self.subsystem_children = subsystem_children
+    
+    def _load_parent_dependencies(self, subsystem: SubsystemInfo) -> Optional[Dict[str, Any]]:
+        """Return the parent directory's dependencies.json content, or None if it has none."""
+        parent = self.subsystems_by_path.get(subsystem.parent_path)
+        if parent is not None:
+            return parent.dependencies
+        
+        # Every parent inside the target tree is indexed; only the target root's
+        # parent (or an unindexed run) needs to hit the filesystem
+        if self.subsystems_by_path and subsystem.path != self.path_helper.target_path:
+            return None
+        parent_deps_file = subsystem.parent_path / "dependencies.json"
+        if not parent_deps_file.exists():
+            return None
+        return self.file_cache.load_dependencies_json(parent_deps_file)
     
     def check_subsystem_declarations(self, subsystems: List[SubsystemInfo]) -> List[ArchError]:
         """Check that subsystems are declared in parent dependencies.json."""
@@ -36,8 +58,8 @@ class SubsystemRuleChecker:
                 continue
 
             parent_deps_file = parent_dir / "dependencies.json"
-            if parent_deps_file.exists():
-                parent_deps = self.file_cache.load_dependencies_json(parent_deps_file)
+            parent_deps = self._load_parent_dependencies(subsystem)
+            if parent_deps is not None:
                 subsystems_array = parent_deps.get("subsystems", [])
 
                 relative_path = f"./{subsystem.name}"
@@ -70,7 +92,7 @@ class SubsystemRuleChecker:
                     subsystem_path = subsystem.path / subsystem_name
                     deps_file = subsystem_path / "dependencies.json"
 
-                    if not deps_file.exists():
+                    if subsystem_path not in self.subsystems_by_path and not deps_file.exists():
                         # Check if directory exists at all
                         if subsystem_path.exists():
                             recommendation = (
@@ -168,11 +190,10 @@ class SubsystemRuleChecker:
             if not parent_dir or parent_dir == self.path_helper.target_path:
                 continue
             
-            parent_deps_file = parent_dir / "dependencies.json"
-            if not parent_deps_file.exists():
+            parent_deps = self._load_parent_dependencies(subsystem)
+            if parent_deps is None:
                 continue
             
-            parent_deps = self.file_cache.load_dependencies_json(parent_deps_file)
             parent_allowed_children = parent_deps.get("allowedChildren", [])
             
             if not parent_allowed_children:
@@ -364,7 +385,7 @@ class SubsystemRuleChecker:
         errors = []
         # print("Checking for file/folder naming conflicts...")
         
-        typescript_files = find_typescript_files(self.path_helper.target_path)
+        typescript_files = self.file_cache.typescript_files(self.path_helper.target_path)
         
         for ts_file in typescript_files:
             stem = ts_file.stem
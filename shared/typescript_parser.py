@@ -13,6 +13,21 @@ from typing import List, Set, Optional, NamedTuple, Tuple
 from dataclasses import dataclass
 
 
+# Start of an interface declaration (extract_functions skips interface bodies)
+_INTERFACE_RE = re.compile(r'(?:export\s+)?interface\s+\w+')
+
+# Characters that make brace counting on a line depend on string literals
+_STRING_DELIMITERS = ("'", '"', '`', '\\')
+
+# Parentheses, for jumping between them when collecting a parameter list
+_PAREN_RE = re.compile(r'[()]')
+
+# Type annotations and default values stripped from an argument before counting it
+_OBJECT_TYPE_ANNOTATION_RE = re.compile(r':\s*\{[^}]*\}')
+_SIMPLE_TYPE_ANNOTATION_RE = re.compile(r':\s*[^=,{}]+')
+_DEFAULT_VALUE_RE = re.compile(r'=.*$')
+
+
 @dataclass
 class Import:
     """Represents an import statement."""
@@ -84,6 +99,8 @@ class TypeScriptParser:
             # Class methods: public/private/static methodName()
             r'^\s*(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(?:async\s+)?(\w+)\s*\(',
         ]
+        # Compiled once; extract_functions tries them on every line
+        self._function_regexes = [re.compile(pattern) for pattern in self.function_patterns]
 
     def extract_imports(self, content: str, file_path: Path) -> List[Import]:
         """Extract import statements from file content with multi-line support."""
@@ -619,8 +636,30 @@ class TypeScriptParser:
 
     def extract_functions(self, content: str, file_path: Path) -> List[FunctionInfo]:
         """Extract function information for Rule of 6 checking."""
-        functions = []
+        return self._extract_functions_from_lines(content.split('\n'), file_path)
+
+    def extract_all(self, content: str, file_path: Path, max_keys: int = 6) -> Tuple[List[FunctionInfo], List[tuple[int, int, str]]]:
+        """
+        Extract functions and object parameter violations in one pass over the content.
+
+        Equivalent to calling extract_functions and find_object_parameter_violations,
+        but the content is split into lines only once.
+        """
+        # Every function pattern needs a '(' and every object parameter a '{';
+        # files without them (re-exports, constants) need no line scan at all
+        has_parens = '(' in content
+        has_braces = '{' in content
+        if not has_parens and not has_braces:
+            return [], []
+
         lines = content.split('\n')
+        functions = self._extract_functions_from_lines(lines, file_path) if has_parens else []
+        violations = self._find_object_parameter_violations_in_lines(lines, max_keys) if has_braces else []
+        return functions, violations
+
+    def _extract_functions_from_lines(self, lines: List[str], file_path: Path) -> List[FunctionInfo]:
+        """Extract function information from already split file content."""
+        functions = []
         
         # Track context to avoid counting interface properties as functions
         in_interface_block = False
@@ -636,7 +675,7 @@ class TypeScriptParser:
                 continue
             
             # Track if we're inside an interface block
-            if re.match(r'(?:export\s+)?interface\s+\w+', line):
+            if _INTERFACE_RE.match(line):
                 in_interface_block = True
                 brace_level = 0
             
@@ -654,8 +693,8 @@ class TypeScriptParser:
             
             function_match = None
             matched_pattern_idx = None
-            for idx, pattern in enumerate(self.function_patterns):
-                match = re.search(pattern, line)
+            for idx, regex in enumerate(self._function_regexes):
+                match = regex.search(line)
                 if match:
                     func_name = match.group(1)
                     # Skip if it's a control flow keyword
@@ -761,9 +800,9 @@ class TypeScriptParser:
 
             # Remove type annotations and default values
             # Handle complex types like { prop: string }
-            arg = re.sub(r':\s*\{[^}]*\}', '', arg)  # Remove object type annotations
-            arg = re.sub(r':\s*[^=,{}]+', '', arg)   # Remove simple type annotations
-            arg = re.sub(r'=.*$', '', arg)           # Remove default values
+            arg = _OBJECT_TYPE_ANNOTATION_RE.sub('', arg)  # Remove object type annotations
+            arg = _SIMPLE_TYPE_ANNOTATION_RE.sub('', arg)  # Remove simple type annotations
+            arg = _DEFAULT_VALUE_RE.sub('', arg)           # Remove default values
             arg = arg.strip()
 
             if arg:
@@ -959,8 +998,11 @@ class TypeScriptParser:
 
     def find_object_parameter_violations(self, content: str, file_path: Path, max_keys: int = 6) -> List[tuple[int, int, str]]:
         """Find object parameters that violate the Rule of 6 (more than max_keys keys)."""
+        return self._find_object_parameter_violations_in_lines(content.split('\n'), max_keys)
+
+    def _find_object_parameter_violations_in_lines(self, lines: List[str], max_keys: int) -> List[tuple[int, int, str]]:
+        """Find object parameter violations in already split file content."""
         violations = []
-        lines = content.split('\n')
         
         for i, line in enumerate(lines, 1):
             line_stripped = line.strip()
@@ -1015,38 +1057,49 @@ class TypeScriptParser:
         if paren_pos == -1:
             return ""
 
-        # Start collecting parameters from the opening parenthesis
+        # Start collecting parameters from the opening parenthesis. Only the
+        # parentheses change the state, so the scan jumps from one to the next
+        # and collects the text in between as whole slices.
         paren_count = 0
-        params = ""
+        params: List[str] = []
 
         for i in range(start_line_idx, len(lines)):
             line = lines[i]
 
             # Start from the opening parenthesis position on the first line
-            start_pos = paren_pos if i == start_line_idx else 0
-            line_part = line[start_pos:]
+            pos = paren_pos if i == start_line_idx else 0
+
+            for match in _PAREN_RE.finditer(line, pos):
+                paren_pos_in_line = match.start()
+                # Only collect characters inside the parentheses
+                if paren_count > 0:
+                    params.append(line[pos:paren_pos_in_line])
+                pos = paren_pos_in_line + 1
 
-            for char in line_part:
-                if char == '(':
+                if line[paren_pos_in_line] == '(':
+                    # Opening parentheses themselves are never collected
                     paren_count += 1
-                elif char == ')':
+                else:
                     paren_count -= 1
                     if paren_count == 0:
                         # Found the closing parenthesis, return the collected parameters
-                        return params.strip()
+                        return ''.join(params).strip()
+                    params.append(')')
 
-                # Only collect characters inside the parentheses (not the parentheses themselves)
-                if paren_count > 0 and char != '(':
-                    params += char
+            if paren_count > 0:
+                params.append(line[pos:])
+                # Add newline if we're continuing to the next line
+                if i < len(lines) - 1:
+                    params.append('\n')
 
-            # Add newline if we're continuing to the next line
-            if paren_count > 0 and i < len(lines) - 1:
-                params += '\n'
-
-        return params.strip()
+        return ''.join(params).strip()
 
     def _count_braces_outside_strings(self, line: str) -> int:
         """Count { and } braces while ignoring those inside string literals."""
+        # Without quotes or escapes every brace counts, so let str.count do it
+        if not any(delimiter in line for delimiter in _STRING_DELIMITERS):
+            return line.count('{') - line.count('}')
+
         brace_count = 0
         in_single_quote = False
         in_double_quote = False
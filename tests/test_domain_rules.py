@@ -0,0 +1,134 @@
+"""
+Tests for the domain import helpers.
+
+The import restriction check classifies each file once, by the quoted
+text after every `from ` in it and by the domains its path lies in.
+"""
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from architecture.rules.domain_rules import (
+    _forbidden_domain_imports,
+    _from_specifiers,
+    _path_domains
+)
+
+
+class TestFromSpecifiers:
+    """Quoted text after each `from `, quotes included."""
+
+    def test_single_and_double_quotes(self):
+        """Both quote styles are kept as written."""
+        content = "import { a } from '~/lib/a';\nimport { b } from \"~/lib/b\";\n"
+        assert _from_specifiers(content) == {"'~/lib/a'", '"~/lib/b"'}
+
+    def test_unclosed_quote_runs_to_the_end(self):
+        """Without a closing quote the specifier is the rest of the content."""
+        assert _from_specifiers("import { a } from '~/lib/a\nexport {}") == {"'~/lib/a\nexport {}"}
+
+    def test_from_without_quote(self):
+        """`from ` not followed by a quote is no specifier."""
+        assert _from_specifiers("const from = 1;\nimport x from y;\n") == set()
+
+    def test_overlapping_occurrences(self):
+        """A `from ` inside a specifier is found as well."""
+        content = "import { a } from 'x from \"~/lib/b\"';\n"
+        assert _from_specifiers(content) == {"'x from \"~/lib/b\"'", '"~/lib/b"'}
+
+    def test_repeated_from(self):
+        """Only the `from ` directly before a quote yields a specifier."""
+        assert _from_specifiers("from from 'a' from 'a'") == {"'a'"}
+
+    @pytest.mark.parametrize("content", [
+        "import { a } from '~/lib/domains/x/services';",
+        "from 'a' from \"b\" from 'c",
+        "x from 'from 'y' from \"z",
+        "from '' from \"\"",
+    ])
+    def test_matches_substring_checks(self, content):
+        """`from 'X'` occurs iff "'X'" is a specifier, and `from 'P` iff a specifier starts with "'P"."""
+        specifiers = _from_specifiers(content)
+        for start in range(len(content)):
+            for end in range(start, len(content) + 1):
+                text = content[start:end]
+                for quote in "'\"":
+                    if quote in text:
+                        continue
+                    assert (f"from {quote}{text}{quote}" in content) == (f"{quote}{text}{quote}" in specifiers)
+                    assert (f"from {quote}{text}" in content) == any(
+                        specifier.startswith(f"{quote}{text}") for specifier in specifiers
+                    )
+
+
+class TestPathDomains:
+    """Domains a path lies in, and whether it is in their services."""
+
+    @pytest.mark.parametrize("file_path, domains", [
+        ("src/app/page.tsx", {}),
+        ("src/lib/domains/auth", {}),
+        ("src/lib/domains/auth/index.ts", {"auth": False}),
+        ("src/lib/domains/auth/services/user.ts", {"auth": True}),
+        ("src/lib/domains/auth/servicesX/user.ts", {"auth": True}),
+        ("src/lib/domains/auth/utils/services/x.ts", {"auth": False}),
+    ])
+    def test_single_domain(self, file_path, domains):
+        """One lib/domains/ segment names one domain."""
+        assert _path_domains(file_path) == domains
+
+    @pytest.mark.parametrize("file_path, domains", [
+        ("lib/domains/a/lib/domains/b/services/x.ts", {"a": False, "b": True}),
+        ("lib/domains/a/services/lib/domains/b/x.ts", {"a": True, "b": False}),
+        ("lib/domains/a/x/lib/domains/a/services/y.ts", {"a": True}),
+        ("lib/domains/a/services/lib/domains/a/y.ts", {"a": True}),
+        ("lib/domains/lib/domains/b/x.ts", {"lib": False, "b": False}),
+    ])
+    def test_repeated_domain_segments(self, file_path, domains):
+        """Every lib/domains/<name>/ in the path counts, overlapping ones included."""
+        assert _path_domains(file_path) == domains
+
+    @pytest.mark.parametrize("file_path", [
+        "lib/domains/a/lib/domains/b/services/x.ts",
+        "lib/domains/lib/domains/b/x.ts",
+        "src/lib/domains/auth/servicesX/user.ts",
+    ])
+    def test_matches_substring_checks(self, file_path):
+        """'lib/domains/<name>/' occurs iff name is a key, 'lib/domains/<name>/services' iff its value is true."""
+        domains = _path_domains(file_path)
+        for name in set(file_path.split("/")):
+            assert (f"lib/domains/{name}/" in file_path) == (name in domains)
+            assert (f"lib/domains/{name}/services" in file_path) == domains.get(name, False)
+
+
+class TestForbiddenDomainImports:
+    """Domains whose services, infrastructure, private parts or index are imported."""
+
+    def test_forbidden_parts(self):
+        """Anything but a domain's utils is forbidden, in either quote style."""
+        specifiers = {
+            "'~/lib/domains/a/services'",
+            "'~/lib/domains/b/utils/format'",
+            '"~/lib/domains/c/_objects"',
+            "'~/lib/domains/d/index'",
+            "'~/lib/domains/e/infrastructure/db",
+        }
+        assert _forbidden_domain_imports(specifiers) == {"a", "c", "d", "e"}
+
+    @pytest.mark.parametrize("specifier", [
+        "'~/lib/domains/a'",
+        "'~/lib/domains/a/utils'",
+        "'~/lib/a/services'",
+        "'./lib/domains/a/services'",
+        "'~/lib/domains/'",
+    ])
+    def test_allowed(self, specifier):
+        """Domain roots, utils and paths outside ~/lib/domains/ are allowed."""
+        assert _forbidden_domain_imports({specifier}) == set()
+
+    def test_repeated_domain_segments(self):
+        """Only the first domain in a specifier counts."""
+        assert _forbidden_domain_imports({"'~/lib/domains/a/utils/lib/domains/b/services'"}) == set()
+        assert _forbidden_domain_imports({"'~/lib/domains/a/services/~/lib/domains/b/utils'"}) == {"a"}
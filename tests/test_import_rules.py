@@ -0,0 +1,134 @@
+"""
+Tests for the import boundary scan.
+
+External files importing below a subsystem path are found with one regex
+built from every subsystem import path by _path_alternation.
+"""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from architecture.checker import ArchitectureChecker
+from architecture.rules.import_rules import _path_alternation
+
+
+def _write_project(root, files):
+    """Write files (relative path -> content) below root."""
+    for relative_path, content in files.items():
+        file_path = root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+
+
+def _boundary_violations():
+    """Import boundary violations of the project in the current directory, as {subsystem: [(file, line, import path)]}."""
+    checker = ArchitectureChecker("src")
+    deps_files, _ = checker._walk_target_tree()
+    subsystems = checker._find_all_subsystems(deps_files)
+    violations = checker.import_checker._find_import_boundary_violations(subsystems)
+    return {
+        str(subsystem_path): sorted(
+            (str(violation['file']), violation['line'], re.search(r"['\"](.*)['\"]", violation['import']).group(1))
+            for violation in subsystem_violations
+        )
+        for subsystem_path, subsystem_violations in violations.items()
+    }
+
+
+class TestPathAlternation:
+    """The alternation matches exactly the paths it was built from."""
+
+    PATHS = ["~/lib", "~/lib/a", "~/lib/ab", "~/lib/a/b", "~/lib/a.b", "~/lib/x+(y)", "~/app/[id]"]
+
+    def _matches(self, candidate):
+        return re.fullmatch(_path_alternation(self.PATHS), candidate) is not None
+
+    def test_matches_every_path(self):
+        """Every path matches, including nested paths and their ancestors."""
+        for path in self.PATHS:
+            assert self._matches(path), path
+
+    @pytest.mark.parametrize("candidate", [
+        "~", "~/li", "~/lib/", "~/lib/abc", "~/lib/a/", "~/lib/a/bc", "~/lib/a/b/c", "~/app",
+    ])
+    def test_rejects_prefixes_and_extensions(self, candidate):
+        """Partial segments, extra segments and bare ancestors do not match."""
+        assert not self._matches(candidate)
+
+    @pytest.mark.parametrize("candidate", ["~/lib/aXb", "~/lib/xx(y)", "~/lib/x+(y", "~/app/i", "~/app/[id"])
+    def test_metacharacters_are_literal(self, candidate):
+        """Regex metacharacters in directory names only match themselves."""
+        assert not self._matches(candidate)
+
+    def test_shared_prefix_is_not_a_match(self):
+        """~/lib/a does not match the start of ~/lib/ab, and neither does ~/lib/ab of ~/lib/abc."""
+        pattern = re.compile(_path_alternation(["~/lib/a", "~/lib/ab"]) + "/")
+        assert pattern.match("~/lib/a/x")
+        assert pattern.match("~/lib/ab/x")
+        assert not pattern.match("~/lib/abc/x")
+
+
+class TestImportBoundaryScan:
+    """Imports going below a subsystem path from outside it are violations."""
+
+    @pytest.fixture(autouse=True)
+    def project(self, tmp_path, monkeypatch):
+        """A project with nested subsystems, a shared name prefix and metacharacters in a name."""
+        subsystem = json.dumps({"type": "boundary"})
+        _write_project(tmp_path, {
+            ".git/HEAD": "",
+            "src/lib/a/dependencies.json": subsystem,
+            "src/lib/a/index.ts": "export * from './impl';\n",
+            "src/lib/a/impl.ts": "export const a = 1;\n",
+            "src/lib/a/inner/dependencies.json": subsystem,
+            "src/lib/a/inner/index.ts": "export * from './impl';\n",
+            "src/lib/a/inner/impl.ts": "import { a } from '~/lib/a/impl';\nexport const inner = a;\n",
+            "src/lib/ab/dependencies.json": subsystem,
+            "src/lib/ab/index.ts": "export * from './impl';\n",
+            "src/lib/ab/impl.ts": "export const ab = 1;\n",
+            "src/lib/x.y+z/dependencies.json": subsystem,
+            "src/lib/x.y+z/index.ts": "export * from './impl';\n",
+            "src/lib/x.y+z/impl.ts": "export const xyz = 1;\n",
+        })
+        monkeypatch.chdir(tmp_path)
+
+    def _scan(self, imports):
+        """Violations for src/app/page.ts importing each of imports on its own line."""
+        _write_project(Path("."), {
+            "src/app/page.ts": "".join(f"import {{ x{i} }} from '{path}';\n" for i, path in enumerate(imports)),
+        })
+        return _boundary_violations()
+
+    def test_import_equal_to_subsystem_path(self):
+        """Importing a subsystem itself or its index goes through the interface."""
+        assert self._scan(["~/lib/a", "~/lib/ab", "~/lib/x.y+z", "~/lib/a/index"]) == {}
+
+    def test_shared_prefix(self):
+        """An import below ~/lib/ab is not an import below ~/lib/a."""
+        assert self._scan(["~/lib/ab/impl", "~/lib/abc/impl"]) == {
+            "src/lib/ab": [("src/app/page.ts", 1, "~/lib/ab/impl")],
+        }
+
+    def test_nested_subsystems(self):
+        """An import below a nested subsystem goes below each enclosing subsystem too."""
+        assert self._scan(["~/lib/a/impl", "~/lib/a/inner/impl"]) == {
+            "src/lib/a": [("src/app/page.ts", 1, "~/lib/a/impl"), ("src/app/page.ts", 2, "~/lib/a/inner/impl")],
+            "src/lib/a/inner": [("src/app/page.ts", 2, "~/lib/a/inner/impl")],
+        }
+
+    def test_internal_imports(self):
+        """Files inside a subsystem, its child subsystems included, are not external importers."""
+        assert "src/lib/a" not in self._scan([])
+
+    def test_metacharacters_in_directory_names(self):
+        """A subsystem named x.y+z only matches imports spelling its name literally."""
+        assert self._scan(["~/lib/xAy+z/impl", "~/lib/x.yyz/impl", "~/lib/x.y+z/impl"]) == {
+            "src/lib/x.y+z": [("src/app/page.ts", 3, "~/lib/x.y+z/impl")],
+        }
@@ -0,0 +1,116 @@
+"""
+Tests for the JSON serialization of check results.
+
+CheckResults.to_json writes the report straight from the issue objects and
+must produce the same text as json.dumps over to_dict().
+"""
+
+import io
+import json
+from pathlib import Path
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from architecture.models import (
+    ArchError,
+    CheckResults,
+    ErrorType,
+    RecommendationType,
+    Severity
+)
+
+
+def _expected_json(results: CheckResults) -> str:
+    """The report as json.dumps writes it from the to_dict() mapping."""
+    return json.dumps(results.to_dict(), indent=2, default=str)
+
+
+def _results(*issues: ArchError) -> CheckResults:
+    """Check results holding the given issues, with a fixed execution time."""
+    results = CheckResults(target_path="src", execution_time=0.25)
+    results.extend(issues)
+    return results
+
+
+class TestCheckResultsToJson:
+    """CheckResults.to_json must match json.dumps(to_dict(), indent=2, default=str)."""
+
+    def test_no_issues(self):
+        """An empty report matches."""
+        results = _results()
+        assert results.to_json() == _expected_json(results)
+
+    def test_plain_issues(self):
+        """Errors and warnings without metadata match."""
+        results = _results(
+            ArchError.create_error(
+                message="Import crosses a subsystem boundary",
+                error_type=ErrorType.IMPORT_BOUNDARY,
+                subsystem="src/lib/a",
+                file_path="src/lib/a/index.ts",
+                line_number=3,
+                recommendation="Import from the subsystem index",
+                recommendation_type=RecommendationType.CREATE_README,
+            ),
+            ArchError(
+                message="Too many functions",
+                error_type=ErrorType.COMPLEXITY,
+                severity=Severity.WARNING,
+            ),
+        )
+        assert results.to_json() == _expected_json(results)
+        json.loads(results.to_json())
+
+    def test_metadata(self):
+        """Metadata keys follow the base keys, with nested values indented."""
+        results = _results(ArchError(
+            message="Too many functions",
+            error_type=ErrorType.COMPLEXITY,
+            file_path="src/lib/a/page.tsx",
+            metadata={"count": 7, "functions": ["a", "b"], "limits": {"max": 6}, "path": Path("src/x")},
+        ))
+        assert results.to_json() == _expected_json(results)
+
+    def test_metadata_overriding_base_key(self):
+        """A metadata key replacing a base key keeps the base key's position."""
+        results = _results(ArchError(
+            message="Too many functions",
+            error_type=ErrorType.COMPLEXITY,
+            line_number=4,
+            metadata={"extra": True, "line": 12, "severity": "info"},
+        ))
+        assert results.to_json() == _expected_json(results)
+        assert json.loads(results.to_json())["errors"][0]["line"] == 12
+
+    def test_non_ascii_text(self):
+        """Non-ASCII messages, paths and metadata are escaped as json.dumps escapes them."""
+        results = _results(ArchError(
+            message="Fichier trop long — « données »",
+            error_type=ErrorType.COMPLEXITY,
+            file_path="src/lib/données/ü.ts",
+            recommendation="Découper le fichier \U0001F600",
+            metadata={"clé": "valeur\n\t\"quoted\"", "名前": ["日本"]},
+        ))
+        assert results.to_json() == _expected_json(results)
+        assert json.loads(results.to_json())["errors"][0]["message"] == "Fichier trop long — « données »"
+
+    def test_non_string_metadata_keys(self):
+        """int, float, bool and None metadata keys are coerced to strings as json.dumps does."""
+        results = _results(ArchError(
+            message="Too many functions",
+            error_type=ErrorType.COMPLEXITY,
+            metadata={7: "seven", 2.5: "half", True: "yes", None: "none", "name": "x"},
+        ))
+        assert results.to_json() == _expected_json(results)
+        assert set(json.loads(results.to_json())["errors"][0]) >= {"7", "2.5", "true", "null", "name"}
+
+    def test_write_json_matches_to_json(self):
+        """Streaming to a file writes the same document, timestamp included."""
+        results = _results(ArchError(message="m", error_type=ErrorType.COMPLEXITY, metadata={"k": 1}))
+        buffer = io.StringIO()
+        results.write_json(buffer, timestamp="2024-01-01T00:00:00")
+        expected = results.to_dict()
+        expected["timestamp"] = "2024-01-01T00:00:00"
+        assert buffer.getvalue() == json.dumps(expected, indent=2, default=str)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
 
 
@@ -27,9 +28,12 @@ class SubsystemNode:
 def find_dependencies_files(target_path: Path) -> list[Path]:
     """Find all dependencies.json files under target path, excluding node_modules."""
     return sorted(
-        deps_file
-        for deps_file in target_path.rglob("dependencies.json")
-        if "node_modules" not in str(deps_file)
+        (
+            deps_file
+            for deps_file in target_path.rglob("dependencies.json")
+            if "node_modules" not in str(deps_file)
+        ),
+        key=attrgetter("parts"),
     )
 
 
@@ -105,9 +109,10 @@ def _count_typescript_lines(directory: Path) -> int:
                 continue
             try:
                 with open(file_path, "rb") as f:
-                    total += sum(1 for _ in f)
+                    data = f.read()
             except OSError:
-                pass
+                continue
+            total += data.count(b"\n") + (0 if not data or data.endswith(b"\n") else 1)
     for subdir in directory.iterdir():
         if subdir.is_dir() and not (subdir / "dependencies.json").exists():
             total += _count_typescript_lines(subdir)
@@ -6,9 +6,10 @@ Handles parsing and validation of .architecture-exceptions and .ruleof6-exceptio
 """
 
 import fnmatch
+import os
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from dataclasses import dataclass
 
 
@@ -207,6 +208,8 @@ class RuleOf6ExceptionHandler:
         self.project_root = project_root
         self._file_exceptions: Dict[str, RuleOf6Exception] = {}
         self._function_exceptions: Dict[str, RuleOf6Exception] = {}
+        # Function exception keys compiled as fnmatch patterns, built on first lookup
+        self._function_patterns: Optional[List[Tuple[re.Pattern, RuleOf6Exception]]] = None
         self._loaded_files: List[str] = []
 
     def load_exceptions(self, target_path: Path) -> None:
@@ -286,6 +289,7 @@ class RuleOf6ExceptionHandler:
             if function_name:
                 func_key = f"{file_path_str}:{function_name}"
                 self._function_exceptions[func_key] = exception
+                self._function_patterns = None
             else:
                 normalized_path = self._normalize_path(file_path_str)
                 self._file_exceptions[normalized_path] = exception
@@ -317,12 +321,30 @@ class RuleOf6ExceptionHandler:
         func_key = f"{file_path}:{function_name}"
         if func_key in self._function_exceptions:
             return self._function_exceptions[func_key]
-        # Try wildcard patterns
-        for pattern_key, rule in self._function_exceptions.items():
-            if fnmatch.fnmatch(func_key, pattern_key):
+        # Try wildcard patterns (same matching as fnmatch.fnmatch, compiled once)
+        if self._function_patterns is None:
+            self._function_patterns = [
+                (re.compile(fnmatch.translate(os.path.normcase(pattern_key))), rule)
+                for pattern_key, rule in self._function_exceptions.items()
+            ]
+        func_key = os.path.normcase(func_key)
+        for pattern, rule in self._function_patterns:
+            if pattern.match(func_key):
                 return rule
         return None
 
+    def get_function_exceptions_for_file(self, file_path: str, function_names: Iterable[str]) -> Dict[str, RuleOf6Exception]:
+        """Get the custom thresholds of a file's functions in one batch, keyed by function name."""
+        if not self._function_exceptions:
+            return {}
+        rules: Dict[str, RuleOf6Exception] = {}
+        for function_name in function_names:
+            if function_name not in rules:
+                rule = self.get_function_exception(file_path, function_name)
+                if rule:
+                    rules[function_name] = rule
+        return rules
+
     def has_exceptions(self) -> bool:
         """Check if any exceptions were loaded."""
         return bool(self._file_exceptions or self._function_exceptions)
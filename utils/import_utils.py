@@ -7,7 +7,7 @@ Handles import parsing and dependency resolution.
 
 import re
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, Iterable, List, Set, Tuple
 
 from ..models import SubsystemInfo
 from ..shared.typescript_parser import TypeScriptParser
@@ -145,16 +145,69 @@ def import_goes_into_subsystem(import_path: str) -> bool:
     return False
 
 
+def path_boundary_prefixes(import_path: str) -> List[str]:
+    """Each prefix of the import path that ends right before a '/'."""
+    prefixes = []
+    separator = import_path.find('/')
+    while separator != -1:
+        prefixes.append(import_path[:separator])
+        separator = import_path.find('/', separator + 1)
+    return prefixes
+
+
+def build_allowed_index(allowed_set: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    """Group allowed dependencies by their path without trailing slashes, for is_import_allowed_by_index."""
+    index: Dict[str, List[str]] = {}
+    for allowed_dep in allowed_set:
+        if allowed_dep:
+            index.setdefault(allowed_dep.rstrip('/'), []).append(allowed_dep)
+    return {path: tuple(allowed_deps) for path, allowed_deps in index.items()}
+
+
 def is_import_allowed_by_set(import_path: str, allowed_set: Set[str],
                             subsystem_path: Path) -> bool:
     """Check if import is allowed by a set of allowed dependencies with proper hierarchical logic."""
-    # Convert subsystem_path to absolute path format for internal import checking
+    subsystem_abs_path = _subsystem_import_path(subsystem_path)
+    if _is_implicitly_allowed(import_path, subsystem_abs_path):
+        return True
+    
+    # Check direct matches and hierarchical matches
+    return any(
+        _is_allowed_by_dependency(import_path, allowed_dep, subsystem_path, subsystem_abs_path)
+        for allowed_dep in allowed_set
+    )
+
+
+def is_import_allowed_by_index(import_path: str, allowed_index: Dict[str, Tuple[str, ...]],
+                               subsystem_path: Path) -> bool:
+    """Same as is_import_allowed_by_set, given the allowed dependencies as built by build_allowed_index.
+
+    Only dependencies that can match are checked: the import path itself,
+    and those the import path extends at a '/'.
+    """
+    subsystem_abs_path = _subsystem_import_path(subsystem_path)
+    if _is_implicitly_allowed(import_path, subsystem_abs_path):
+        return True
+    
+    candidate_paths = set(path_boundary_prefixes(import_path))
+    candidate_paths.add(import_path.rstrip('/'))
+    return any(
+        _is_allowed_by_dependency(import_path, allowed_dep, subsystem_path, subsystem_abs_path)
+        for path in candidate_paths
+        for allowed_dep in allowed_index.get(path, ())
+    )
+
+
+def _subsystem_import_path(subsystem_path: Path) -> str:
+    """Absolute import path of a subsystem."""
     # Handle special case where subsystem is src itself
     if subsystem_path == Path('src'):
-        subsystem_abs_path = "~"
-    else:
-        subsystem_abs_path = f"~/{subsystem_path.relative_to(Path('src'))}"
+        return "~"
+    return f"~/{subsystem_path.relative_to(Path('src'))}"
 
+
+def _is_implicitly_allowed(import_path: str, subsystem_abs_path: str) -> bool:
+    """Check if import is allowed whatever the allowed dependencies: internal and domain utils imports."""
     # Allow internal imports within the same subsystem
     if (import_path.startswith(f"{subsystem_abs_path}/") or
         import_path == subsystem_abs_path):
@@ -163,65 +216,68 @@ def is_import_allowed_by_set(import_path: str, allowed_set: Set[str],
     # Always allow domain utils imports (implicitly allowed)
     if "/lib/domains/" in import_path and "/utils" in import_path:
         # Check if it's a domain utils import: ~/lib/domains/{domain}/utils or ~/lib/domains/{domain}/utils/*
-        import re
         utils_pattern = r"~/lib/domains/[^/]+/utils(?:/.*)?$"
         if re.match(utils_pattern, import_path):
             return True
     
-    # Check direct matches and hierarchical matches
-    for allowed_dep in allowed_set:
-        if not allowed_dep:
-            continue
-            
-        # Direct match
-        if import_path == allowed_dep:
-            return True
+    return False
+
+
+def _is_allowed_by_dependency(import_path: str, allowed_dep: str, subsystem_path: Path,
+                              subsystem_abs_path: str) -> bool:
+    """Check if import is allowed by one allowed dependency (exact match or hierarchical)."""
+    if not allowed_dep:
+        return False
         
-        # Hierarchical match: if ~/lib/utils is allowed, allow ~/lib/utils/something
-        # Also handle patterns ending with / (like ~/components/ui/)
-        allowed_dep_normalized = allowed_dep.rstrip('/')
+    # Direct match
+    if import_path == allowed_dep:
+        return True
+    
+    # Hierarchical match: if ~/lib/utils is allowed, allow ~/lib/utils/something
+    # Also handle patterns ending with / (like ~/components/ui/)
+    allowed_dep_normalized = allowed_dep.rstrip('/')
+    
+    if (import_path.startswith(f"{allowed_dep_normalized}/") or 
+        (allowed_dep.endswith('/') and import_path.startswith(allowed_dep))):
+        # Extract the child path
+        prefix = allowed_dep if allowed_dep.endswith('/') else f"{allowed_dep_normalized}/"
+        child_path = import_path[len(prefix):]
         
-        if (import_path.startswith(f"{allowed_dep_normalized}/") or 
-            (allowed_dep.endswith('/') and import_path.startswith(allowed_dep))):
-            # Extract the child path
-            prefix = allowed_dep if allowed_dep.endswith('/') else f"{allowed_dep_normalized}/"
-            child_path = import_path[len(prefix):]
-            
-            if not child_path:  # Empty child path means exact match
-                return True
-            
-            # Convert ~/path to src/path for file system checking
-            if allowed_dep_normalized.startswith("~/"):
-                potential_subsystem_path = Path("src") / allowed_dep_normalized[2:] / child_path
-            else:
-                potential_subsystem_path = Path(allowed_dep_normalized) / child_path
-            
-            # CRITICAL: If trying to import INTO a declared subsystem, must use subsystem interface
-            # Even with broad permissions, subsystem boundaries are protected
-            # BUT: Allow imports within the same domain hierarchy AND within current allowed hierarchy
-            if import_goes_into_subsystem(import_path):
-                # Allow if it's within the current subsystem's hierarchy
-                if import_path.startswith(f"{subsystem_abs_path}/"):
-                    # This is within our current subsystem, allow it
-                    pass
-                # Allow if both the import target and current subsystem are within the same allowed hierarchy
-                elif import_path.startswith(f"{allowed_dep_normalized}/") and subsystem_abs_path.startswith(f"{allowed_dep_normalized}/"):
-                    # Both are within the same allowed parent hierarchy, allow it
-                    pass
-                # Check if this is a cross-domain import (not allowed)
-                # or same-domain hierarchical import (allowed)
-                elif not is_same_domain_hierarchical_import(import_path, subsystem_path):
-                    continue  # Blocked: must use subsystem interface
-            
-            # If child is a subsystem (has dependencies.json), require explicit permission  
-            # BUT only for grandchildren, not direct children
-            if (potential_subsystem_path / "dependencies.json").exists():
-                # Check if this is a direct child or a deeper nesting
-                slash_count = child_path.count('/')
-                if slash_count > 0:  # This is a grandchild or deeper, block it
-                    continue  # Child is subsystem, needs explicit permission
-            
-            # Otherwise, hierarchy allows it
+        if not child_path:  # Empty child path means exact match
             return True
+        
+        # Convert ~/path to src/path for file system checking
+        if allowed_dep_normalized.startswith("~/"):
+            potential_subsystem_path = Path("src") / allowed_dep_normalized[2:] / child_path
+        else:
+            potential_subsystem_path = Path(allowed_dep_normalized) / child_path
+        
+        # CRITICAL: If trying to import INTO a declared subsystem, must use subsystem interface
+        # Even with broad permissions, subsystem boundaries are protected
+        # BUT: Allow imports within the same domain hierarchy AND within current allowed hierarchy
+        if import_goes_into_subsystem(import_path):
+            # Allow if it's within the current subsystem's hierarchy
+            if import_path.startswith(f"{subsystem_abs_path}/"):
+                # This is within our current subsystem, allow it
+                pass
+            # Allow if both the import target and current subsystem are within the same allowed hierarchy
+            elif import_path.startswith(f"{allowed_dep_normalized}/") and subsystem_abs_path.startswith(f"{allowed_dep_normalized}/"):
+                # Both are within the same allowed parent hierarchy, allow it
+                pass
+            # Check if this is a cross-domain import (not allowed)
+            # or same-domain hierarchical import (allowed)
+            elif not is_same_domain_hierarchical_import(import_path, subsystem_path):
+                return False  # Blocked: must use subsystem interface
+        
+        # If child is a subsystem (has dependencies.json), require explicit permission  
+        # BUT only for grandchildren, not direct children
+        if (potential_subsystem_path / "dependencies.json").exists():
+            # Check if this is a direct child or a deeper nesting
+            slash_count = child_path.count('/')
+            if slash_count > 0:  # This is a grandchild or deeper, block it
+                return False  # Child is subsystem, needs explicit permission
+        
+        # Otherwise, hierarchy allows it
+        return True
     
-    return False
\ No newline at end of file
+    return False
@@ -5,8 +5,9 @@ Path utility functions for architecture checking.
 Handles path manipulation and exception checking.
 """
 
+import os
 from pathlib import Path
-from typing import Set
+from typing import Dict, Iterator, List, Set, Tuple
 
 
 class PathHelper:
@@ -14,8 +15,14 @@ class PathHelper:
     
     def __init__(self, target_path: str = "src"):
         self.target_path = Path(target_path)
+        # Paths under the target start with this; see relative_to_target
+        self._target_prefix = os.path.join(str(self.target_path), "")
         self.rule_exceptions: Set[str] = set()
         self.traversal_exceptions: Set[str] = set()
+        self._domain_path_cache: Dict[Path, bool] = {}
+        # Exception lookups per path, asked again by several checks for the same directories
+        self._traversal_exception_cache: Dict[Path, bool] = {}
+        self._rule_exception_cache: Dict[Path, bool] = {}
         self._load_exceptions()
     
     def _load_exceptions(self) -> None:
@@ -37,13 +44,23 @@ class PathHelper:
     
     def is_traversal_exception(self, path: Path) -> bool:
         """Check if path should be skipped entirely during traversal."""
-        path_str = str(path)
-        return any(path_str.startswith(exc) for exc in self.traversal_exceptions)
+        cached = self._traversal_exception_cache.get(path)
+        if cached is None:
+            path_str = str(path)
+            cached = any(path_str.startswith(exc) for exc in self.traversal_exceptions)
+            self._traversal_exception_cache[path] = cached
+        return cached
     
     def is_rule_exception(self, path: Path) -> bool:
         """Check if path is exempt from architecture rules."""
-        path_str = str(path)
-        
+        cached = self._rule_exception_cache.get(path)
+        if cached is None:
+            cached = self._matches_rule_exception(str(path))
+            self._rule_exception_cache[path] = cached
+        return cached
+    
+    def _matches_rule_exception(self, path_str: str) -> bool:
+        """Check a path string against the rule exception patterns."""
         for exc in self.rule_exceptions:
             # Exact match for simple paths
             if path_str == exc:
@@ -60,9 +77,20 @@ class PathHelper:
         
         return False
     
+    def relative_to_target(self, path: Path) -> str:
+        """str(path.relative_to(target_path)), by slicing off the target prefix when path has it."""
+        path_str = str(path)
+        if path_str.startswith(self._target_prefix):
+            return path_str[len(self._target_prefix):]
+        return str(path.relative_to(self.target_path))
+    
     def is_domain_path(self, path: Path) -> bool:
         """Check if path is in a domain."""
-        return str(path).startswith("src/lib/domains/")
+        cached = self._domain_path_cache.get(path)
+        if cached is None:
+            cached = str(path).startswith("src/lib/domains/")
+            self._domain_path_cache[path] = cached
+        return cached
     
     def get_directories_to_check(self) -> list[Path]:
         """Get all directories that should be checked for complexity requirements."""
@@ -78,7 +106,40 @@ class PathHelper:
     def find_dependencies_files(self) -> list[Path]:
         """Find all dependencies.json files in target path."""
         deps_files = []
-        for deps_file in self.target_path.rglob("dependencies.json"):
-            if "node_modules" not in str(deps_file):
-                deps_files.append(deps_file)
-        return deps_files
\ No newline at end of file
+        for dirpath, has_dependencies, _ in self.walk_once():
+            if has_dependencies:
+                deps_file = Path(dirpath) / "dependencies.json"
+                if "node_modules" not in str(deps_file):
+                    deps_files.append(deps_file)
+        return deps_files
+    
+    def walk_once(self) -> Iterator[Tuple[str, bool, List[str]]]:
+        """Walk the target tree once with os.scandir.
+
+        Yields (dirpath, has_dependencies_json, index_file_names) for every
+        directory in pre-order, without following directory symlinks (the
+        same order and coverage as Path.rglob).
+        """
+        pending = [str(self.target_path)]
+        while pending:
+            dirpath = pending.pop()
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            has_dependencies = False
+            index_names = []
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                if name == "dependencies.json":
+                    has_dependencies = True
+                elif name == "index.ts" or name == "index.tsx":
+                    index_names.append(name)
+                if entry.is_dir() and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            
+            yield dirpath, has_dependencies, index_names
+            pending.extend(reversed(subdirs))